@@ -1,96 +1,207 @@
 import os
+import json
+import time
+import uuid
+import weakref
 from logging.config import dictConfig
+
+import click
 from flask import (
     Flask, render_template, request, redirect,
-    url_for, jsonify, flash
+    url_for, jsonify, flash, Response, stream_with_context, g, current_app
 )
-from flask_sqlalchemy import SQLAlchemy
+from flask.cli import with_appcontext
+from sqlalchemy import event as sa_event
 from sqlalchemy.exc import IntegrityError
 
+from models import (
+    db, init_schema, get_revision, bump_revision, sprint_key,
+    SPRINTS_KEY, LOOKUPS_KEY,
+    Sprint, Project, ResourceType, ResourceGroup, Resource, Assignment
+)
+import queries
+from assignments import apply_bulk, parse_operation, as_int, known_ids, reference_error, BulkError
+from etags import revision_etag
+from lookups import lookup_cache
+from sprint_copy import copy_sprint
+from capacity_matrix import capacity_matrix
+import export
+import importer
+import events
+from instrumentation import Instrumentation
+from log_pipeline import pipeline as log_pipeline
+
 # ─── Logging Setup ─────────────────────────────────────────────────────
-dictConfig({
+# Records are queued and written (JSON lines to capacity_planner.log, text
+# to stdout) by a background thread; see log_pipeline.py.
+LOGGING = {
     "version": 1,
-    "formatters": {"default": {"format": "[%(asctime)s] %(levelname)s in %(module)s: %(message)s"}},
+    "disable_existing_loggers": False,
     "handlers": {
-        "wsgi": {"class": "logging.StreamHandler", "stream": "ext://sys.stdout", "formatter": "default"},
-        "file": {"class": "logging.FileHandler", "filename": "capacity_planner.log", "formatter": "default", "level": "INFO"}
+        "queue": {"()": "log_pipeline.queue_handler", "level": "INFO"}
     },
-    "root": {"level": "INFO", "handlers": ["wsgi", "file"]}
-})
+    "root": {"level": "INFO", "handlers": ["queue"]}
+}
+
+# ─── Extensions ───────────────────────────────────────────────────────
+# create_app() builds a fresh Instrumentation (request / SQL / template
+# timings at /metrics) and LiveEvents (Server-Sent Events broker) for each
+# app, so their counters and subscriptions never leak between apps.
+def log_pipeline_metrics():
+    return [
+        '# HELP log_records_dropped_total Log records dropped because the queue was full.',
+        '# TYPE log_records_dropped_total counter',
+        f'log_records_dropped_total {log_pipeline.dropped}',
+    ]
+
+def sse_metrics():
+    # Looked up per request: the engine listeners keep Instrumentation alive,
+    # so it must not hold a reference back to the app.
+    return [
+        '# HELP sse_clients Server-Sent Events clients connected to this worker.',
+        '# TYPE sse_clients gauge',
+        f"sse_clients {current_app.extensions['events'].broker.subscribers()}",
+    ]
+
+
+class ViewRegistry:
+    """
+    Collects the views below so create_app() can install them on each app.
+    Holds only the route table, never per-app state.
+    """
+
+    def __init__(self):
+        self.rules = []
+
+    def route(self, rule, **options):
+        def decorator(view):
+            self.rules.append((rule, options, view))
+            return view
+        return decorator
+
+    def init_app(self, app):
+        for rule, options, view in self.rules:
+            app.add_url_rule(rule, view_func=view, **options)
+
+
+views = ViewRegistry()
 
 # ─── App & DB Setup ───────────────────────────────────────────────────
-app = Flask(__name__, instance_relative_config=True)
-app.secret_key = os.environ.get("SECRET_KEY", "dev")
-os.makedirs(app.instance_path, exist_ok=True)
-app.config.from_pyfile('settings.py', silent=True)
-
-default_sqlite = f"sqlite:///{os.path.join(app.instance_path, 'data.db')}"
-db_url = os.environ.get("DATABASE_URL", default_sqlite)
-app.config['SQLALCHEMY_DATABASE_URI'] = db_url
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-
-# ─── DIAGNOSTICS: ensure we’re using Postgres, not falling back to SQLite ─
-app.logger.info(f"🔍 Using DATABASE_URL={db_url}")
-if db_url == default_sqlite:
-    raise RuntimeError("❗️DATABASE_URL not set! Persistence disabled.")
-
-# Initialize SQLAlchemy
-db = SQLAlchemy(app)
+def engine_options(uri):
+    """Per-worker pool settings; each forked worker builds its own pool."""
+    options = {
+        'pool_pre_ping': True,
+        'pool_recycle':  int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+    }
+    if not uri.startswith('sqlite'):
+        options['pool_size']    = int(os.environ.get('DB_POOL_SIZE', 5))
+        options['max_overflow'] = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    return options
+
+
+def sqlite_pragmas(dbapi_conn, connection_record):
+    # WAL lets readers run alongside the single writer in local multi-worker use.
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
+# Engines of every app built in this process. Pooled connections inherited
+# from the parent (gunicorn --preload) must not be shared, so one fork hook
+# drops them in the child without closing the parent's sockets.
+_engines = weakref.WeakSet()
+
+def dispose_after_fork():
+    for engine in list(_engines):
+        engine.dispose(close=False)
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=dispose_after_fork)
+
+
+def create_app(config=None):
+    """
+    Build a configured app. Nothing here touches the database: engines
+    connect on first use, and the schema is created by `flask init-db`.
+    """
+    dictConfig(LOGGING)
+    app = Flask(__name__, instance_relative_config=True)
+    app.secret_key = os.environ.get("SECRET_KEY", "dev")
+    os.makedirs(app.instance_path, exist_ok=True)
+    app.config.from_pyfile('settings.py', silent=True)
+    app.config.update(config or {})
+
+    default_sqlite = f"sqlite:///{os.path.join(app.instance_path, 'data.db')}"
+    db_url = app.config.setdefault('SQLALCHEMY_DATABASE_URI', os.environ.get("DATABASE_URL", default_sqlite))
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(db_url))
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    if db_url == default_sqlite:
+        app.logger.warning(f"DATABASE_URL not set; using local SQLite at {default_sqlite}")
+
+    db.init_app(app)
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        if engine.dialect.name == 'sqlite' and engine.url.database not in (None, '', ':memory:'):
+            sa_event.listen(engine, 'connect', sqlite_pragmas)
+    _engines.update(engines)
+
+    instrumentation = Instrumentation()
+    instrumentation.collectors.extend([log_pipeline_metrics, sse_metrics])
+    instrumentation.init_app(app)
+    events.LiveEvents(app)
+    views.init_app(app)
+    app.before_request(start_request_log)
+    app.after_request(finish_request_log)
+    app.register_error_handler(Exception, handle_exception)
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(import_command)
+    return app
+
+
+def __getattr__(name):
+    # `gunicorn app:app`, `flask --app app` and `from app import app` build the
+    # default app on first access rather than at import time.
+    if name == 'app':
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# ─── Request Logging ───────────────────────────────────────────────────
+def start_request_log():
+    g.request_id    = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+    g.request_start = time.perf_counter()
+
+def finish_request_log(response):
+    if 'request_start' in g:
+        duration_ms = round((time.perf_counter() - g.request_start) * 1000, 2)
+        current_app.logger.info(
+            f"{request.method} {request.path} {response.status_code}",
+            extra={'status': response.status_code, 'duration_ms': duration_ms}
+        )
+        response.headers['X-Request-ID'] = g.request_id
+    return response
 
 # ─── Global Error Handler ──────────────────────────────────────────────
-@app.errorhandler(Exception)
 def handle_exception(e):
-    app.logger.exception("❌ Unhandled Exception:")
+    current_app.logger.exception("❌ Unhandled Exception:")
     return render_template('error.html', error=e), 500
 
-# ─── Models ────────────────────────────────────────────────────────────
-class Sprint(db.Model):
-    id          = db.Column(db.Integer, primary_key=True)
-    name        = db.Column(db.String(80), nullable=False)
-    projects    = db.relationship('Project',    backref='sprint',    cascade='all, delete-orphan')
-    assignments = db.relationship('Assignment', backref='sprint',    cascade='all, delete-orphan')
-
-class Project(db.Model):
-    id          = db.Column(db.Integer, primary_key=True)
-    name        = db.Column(db.String(80), nullable=False)
-    sprint_id   = db.Column(db.Integer, db.ForeignKey('sprint.id'), nullable=False)
-    assignments = db.relationship('Assignment', backref='project',   cascade='all, delete-orphan')
-
-class ResourceType(db.Model):
-    id        = db.Column(db.Integer, primary_key=True)
-    name      = db.Column(db.String(80), unique=True, nullable=False)
-    resources = db.relationship('Resource', backref='type', cascade='all, delete-orphan')
-
-class ResourceGroup(db.Model):
-    id        = db.Column(db.Integer, primary_key=True)
-    name      = db.Column(db.String(80), unique=True, nullable=False)
-    resources = db.relationship('Resource', backref='group', cascade='all, delete-orphan')
-
-class Resource(db.Model):
-    id          = db.Column(db.Integer, primary_key=True)
-    name        = db.Column(db.String(80), unique=True, nullable=False)
-    type_id     = db.Column(db.Integer, db.ForeignKey('resource_type.id'), nullable=True)
-    group_id    = db.Column(db.Integer, db.ForeignKey('resource_group.id'), nullable=True)
-    assignments = db.relationship('Assignment', backref='resource', cascade='all, delete-orphan')
-
-class Assignment(db.Model):
-    id          = db.Column(db.Integer, primary_key=True)
-    sprint_id   = db.Column(db.Integer, db.ForeignKey('sprint.id'),    nullable=False)
-    project_id  = db.Column(db.Integer, db.ForeignKey('project.id'),   nullable=False)
-    resource_id = db.Column(db.Integer, db.ForeignKey('resource.id'),  nullable=False)
-    capacity    = db.Column(db.Integer, default=100)
-
 # ─── Sprint Views ─────────────────────────────────────────────────────
-@app.route('/')
+@views.route('/')
 def home():
     return redirect(url_for('list_sprints'))
 
-@app.route('/sprints')
+@views.route('/sprints')
+@revision_etag(lambda: [SPRINTS_KEY])
 def list_sprints():
     sprints = Sprint.query.order_by(Sprint.id).all()
     return render_template('sprints.html', sprints=sprints)
 
-@app.route('/sprints', methods=['POST'])
+@views.route('/sprints', methods=['POST'])
 def add_sprint():
     name = request.form.get('name')
     if not name:
@@ -98,104 +209,217 @@ def add_sprint():
         return redirect(url_for('list_sprints'))
     s = Sprint(name=name)
     db.session.add(s)
+    bump_revision(SPRINTS_KEY)
     db.session.commit()
-    app.logger.info(f"Added Sprint(id={s.id})")
+    current_app.logger.info(f"Added Sprint(id={s.id})")
     return redirect(url_for('list_sprints'))
 
-@app.route('/sprints/delete/<int:sprint_id>', methods=['POST'])
+@views.route('/sprints/delete/<int:sprint_id>', methods=['POST'])
 def delete_sprint(sprint_id):
     s = Sprint.query.get_or_404(sprint_id)
     db.session.delete(s)
+    bump_revision(SPRINTS_KEY)
+    bump_revision(sprint_key(sprint_id))
+    events.record_event(sprint_id, 'sprint_deleted')
+    db.session.commit()
+    current_app.logger.info(f"Deleted Sprint(id={sprint_id})")
+    return redirect(url_for('list_sprints'))
+
+@views.route('/sprints/copy/<int:src_id>', methods=['POST'])
+def copy_sprint_route(src_id):
+    src  = Sprint.query.get_or_404(src_id)
+    data = request.get_json(silent=True) or request.form
+    name          = data.get('name') or f"{src.name} (copy)"
+    projects_only = str(data.get('projects_only', '')).lower() in ('1', 'true', 'on', 'yes')
+    try:
+        scale = int(data.get('scale', 100))
+    except (TypeError, ValueError):
+        scale = 0
+    if not 0 < scale <= 100:
+        if request.is_json:
+            return jsonify(success=False, error="'scale' must be between 1 and 100"), 400
+        flash("Scale must be between 1 and 100.", "warning")
+        return redirect(url_for('list_sprints'))
+    new = copy_sprint(src, name, projects_only=projects_only, scale=scale)
+    bump_revision(SPRINTS_KEY)
     db.session.commit()
-    app.logger.info(f"Deleted Sprint(id={sprint_id})")
+    current_app.logger.info(f"Copied Sprint(id={src_id}) to Sprint(id={new.id})")
+    if request.is_json:
+        return jsonify(success=True, sprint={'id': new.id, 'name': new.name})
     return redirect(url_for('list_sprints'))
 
-@app.route('/sprints/<int:sprint_id>')
+def sprint_keys(sprint_id):
+    return [sprint_key(sprint_id), LOOKUPS_KEY]
+
+@views.route('/sprints/<int:sprint_id>')
+@revision_etag(sprint_keys)
 def view_sprint(sprint_id):
-    sprint = Sprint.query.get_or_404(sprint_id)
-    avail_resources = []
-    for r in Resource.query.order_by(Resource.name).all():
-        used      = sum(a.capacity for a in sprint.assignments if a.resource_id == r.id)
-        remaining = 100 - used
-        if remaining > 0:
-            avail_resources.append((r, remaining))
-    types  = ResourceType.query.order_by(ResourceType.name).all()
-    groups = ResourceGroup.query.order_by(ResourceGroup.name).all()
+    sprint            = queries.sprint_board(sprint_id)
+    pool, pool_next   = queries.pool_page(sprint_id)
+    types, groups     = queries.filter_options()
     return render_template(
         'sprint_detail.html',
         sprint=sprint,
-        avail_resources=avail_resources,
+        revision=get_revision(sprint_key(sprint_id)),
+        last_event_id=events.latest_id(),
+        resources=lookup_cache.resources_by_id(
+            {a.resource_id for p in sprint.projects for a in p.assignments}),
+        pool=pool,
+        pool_next=pool_next,
         filter_types=types,
         filter_groups=groups
     )
 
+@views.route('/sprints/<int:sprint_id>/events')
+def sprint_events(sprint_id):
+    # EventSource sends Last-Event-ID on reconnect; the page supplies the first one.
+    last_id = request.headers.get('Last-Event-ID', type=int)
+    if last_id is None:
+        last_id = request.args.get('last_event_id', type=int)
+    return current_app.extensions['events'].stream(sprint_id, last_id)
+
+@views.route('/capacity')
+def capacity_view():
+    return render_template('capacity.html')
+
 # ─── Project CRUD ─────────────────────────────────────────────────────
-@app.route('/sprints/<int:sprint_id>/projects', methods=['POST'])
+@views.route('/sprints/<int:sprint_id>/projects', methods=['POST'])
 def add_project(sprint_id):
     name = request.form.get('name')
     if name:
         p = Project(name=name, sprint_id=sprint_id)
         db.session.add(p)
+        revision = bump_revision(sprint_key(sprint_id))
+        events.record_event(sprint_id, 'project_added',
+                            project={'id': p.id, 'name': p.name}, revision=revision)
         db.session.commit()
-        app.logger.info(f"Added Project(id={p.id}) to Sprint(id={sprint_id})")
+        current_app.logger.info(f"Added Project(id={p.id}) to Sprint(id={sprint_id})")
     return redirect(url_for('view_sprint', sprint_id=sprint_id))
 
-@app.route('/sprints/<int:sprint_id>/projects/edit/<int:proj_id>', methods=['POST'])
+@views.route('/sprints/<int:sprint_id>/projects/edit/<int:proj_id>', methods=['POST'])
 def edit_project(sprint_id, proj_id):
     new_name = request.form.get('name')
     proj     = Project.query.get_or_404(proj_id)
     if new_name:
         proj.name = new_name
+        revision = bump_revision(sprint_key(sprint_id))
+        events.record_event(sprint_id, 'project_renamed',
+                            project={'id': proj.id, 'name': proj.name}, revision=revision)
         db.session.commit()
-        app.logger.info(f"Renamed Project(id={proj_id})")
+        current_app.logger.info(f"Renamed Project(id={proj_id})")
     return redirect(url_for('view_sprint', sprint_id=sprint_id))
 
-@app.route('/sprints/<int:sprint_id>/projects/delete/<int:proj_id>', methods=['POST'])
+@views.route('/sprints/<int:sprint_id>/projects/delete/<int:proj_id>', methods=['POST'])
 def delete_project(sprint_id, proj_id):
     proj = Project.query.get_or_404(proj_id)
+    freed = {a.resource_id for a in proj.assignments}
     db.session.delete(proj)
+    revision = bump_revision(sprint_key(sprint_id))
+    events.record_event(sprint_id, 'project_deleted', project_id=proj_id,
+                        resources=queries.resource_states(sprint_id, sorted(freed)), revision=revision)
     db.session.commit()
-    app.logger.info(f"Deleted Project(id={proj_id})")
+    current_app.logger.info(f"Deleted Project(id={proj_id})")
     return redirect(url_for('view_sprint', sprint_id=sprint_id))
 
 # ─── Assign / Unassign APIs ────────────────────────────────────────────
-@app.route('/assign', methods=['POST'])
+@views.route('/assign', methods=['POST'])
 def assign_resource():
     data = request.json or {}
+    try:
+        # Same rules as a bulk 'assign' operation: integer ids, 1..FULL_CAPACITY.
+        sid = as_int(data.get('sprint_id'), 'sprint_id')
+        op  = parse_operation(dict(data, op='assign'))
+    except BulkError as e:
+        return jsonify(success=False, error=str(e)), 400
+    error = reference_error(sid, op['project_id'], op['resource_id'],
+                            *known_ids(sid, {op['project_id']}, {op['resource_id']}))
+    if error:
+        return jsonify(success=False, error=error), 404
     a = Assignment(
-        sprint_id   = int(data.get('sprint_id', 0)),
-        project_id  = int(data.get('project_id', 0)),
-        resource_id = int(data.get('resource_id', 0)),
-        capacity    = int(data.get('capacity', 100))
+        sprint_id   = sid,
+        project_id  = op['project_id'],
+        resource_id = op['resource_id'],
+        capacity    = op['capacity']
     )
+    # Bump first: the revision row lock (the write lock on SQLite) serialises
+    # writers to this sprint, so the capacity read below cannot go stale.
+    revision = bump_revision(sprint_key(sid))
+    used = queries.used_capacity(sid).get(a.resource_id, 0)
+    if used + a.capacity > queries.FULL_CAPACITY:
+        db.session.rollback()
+        return jsonify(success=False, error=f"Only {queries.FULL_CAPACITY - used}% left"), 409
     db.session.add(a)
+    db.session.flush()
+    delta = dict(
+        assignment={'id': a.id, 'project_id': a.project_id,
+                    'resource_id': a.resource_id, 'capacity': a.capacity},
+        resource=queries.resource_state(a.sprint_id, a.resource_id),
+        revision=revision
+    )
+    events.record_event(a.sprint_id, 'assigned', **delta)
     db.session.commit()
-    app.logger.info(f"Assigned Resource(id={a.resource_id})")
-    return jsonify(success=True)
+    current_app.logger.info(f"Assigned Resource(id={a.resource_id})")
+    return jsonify(success=True, **delta)
 
-@app.route('/unassign', methods=['POST'])
+@views.route('/assign/bulk', methods=['POST'])
+def assign_bulk():
+    data = request.json or {}
+    try:
+        sid = as_int(data.get('sprint_id'), 'sprint_id')
+    except BulkError as e:
+        return jsonify(success=False, error=str(e)), 400
+    ops  = data.get('operations')
+    if not isinstance(ops, list):
+        return jsonify(success=False, error="'operations' must be a list"), 400
+    db.get_or_404(Sprint, sid)
+    # Serialise writers to this sprint before reading its capacity totals.
+    revision = bump_revision(sprint_key(sid))
+    results, ok = apply_bulk(sid, ops)
+    if not ok:
+        db.session.rollback()
+        return jsonify(success=False, results=results), 409
+    events.record_event(sid, 'reload', revision=revision)
+    db.session.commit()
+    current_app.logger.info(f"Applied {len(ops)} bulk operations to Sprint(id={sid})")
+    return jsonify(success=True, results=results, revision=revision)
+
+@views.route('/unassign', methods=['POST'])
 def unassign_resource():
     data = request.json or {}
-    sid = data.get('sprint_id')
-    pid = data.get('project_id')
-    rid = data.get('resource_id')
-    a = Assignment.query.filter_by(
-        sprint_id=sid, project_id=pid, resource_id=rid
-    ).first()
+    try:
+        sid = as_int(data.get('sprint_id'), 'sprint_id')
+        pid = as_int(data.get('project_id'), 'project_id')
+        rid = as_int(data.get('resource_id'), 'resource_id')
+        aid = as_int(data['assignment_id'], 'assignment_id') if data.get('assignment_id') else None
+    except BulkError as e:
+        return jsonify(success=False, error=str(e)), 400
+    q = Assignment.query.filter_by(sprint_id=sid, project_id=pid, resource_id=rid)
+    if aid is not None:
+        q = q.filter_by(id=aid)
+    a = q.first()
     if a:
+        removed = {'id': a.id, 'project_id': pid, 'resource_id': rid, 'capacity': a.capacity}
         db.session.delete(a)
+        revision = bump_revision(sprint_key(sid))
+        delta = dict(
+            assignment=removed,
+            resource=queries.resource_state(sid, rid),
+            revision=revision
+        )
+        events.record_event(sid, 'unassigned', **delta)
         db.session.commit()
-        app.logger.info(f"Unassigned Resource(id={rid})")
-        return jsonify(success=True)
+        current_app.logger.info(f"Unassigned Resource(id={rid})")
+        return jsonify(success=True, **delta)
     return jsonify(success=False), 404
 
 # ─── Resource Type CRUD ─────────────────────────────────────────────────
-@app.route('/types')
+@views.route('/types')
+@revision_etag(lambda: [LOOKUPS_KEY])
 def list_types():
-    ts = ResourceType.query.order_by(ResourceType.name).all()
+    ts, _ = queries.filter_options()
     return render_template('types.html', types=ts)
 
-@app.route('/types', methods=['POST'])
+@views.route('/types', methods=['POST'])
 def add_type():
     name = request.form.get('name')
     if not name:
@@ -204,42 +428,52 @@ def add_type():
     t = ResourceType(name=name)
     db.session.add(t)
     try:
+        bump_revision(LOOKUPS_KEY)
         db.session.commit()
-        app.logger.info(f"Added ResourceType(id={t.id})")
+        lookup_cache.invalidate()
+        current_app.logger.info(f"Added ResourceType(id={t.id})")
     except IntegrityError:
         db.session.rollback()
         flash(f"Type '{name}' already exists.", "warning")
     return redirect(url_for('list_types'))
 
-@app.route('/types/edit/<int:type_id>', methods=['POST'])
+@views.route('/types/edit/<int:type_id>', methods=['POST'])
 def edit_type(type_id):
     new_name = request.form.get('name')
     t = ResourceType.query.get_or_404(type_id)
     if new_name:
         t.name = new_name
+        events.record_event(None, 'type_renamed', type={'id': t.id, 'name': t.name})
         try:
+            bump_revision(LOOKUPS_KEY)
             db.session.commit()
-            app.logger.info(f"Renamed ResourceType(id={type_id})")
+            lookup_cache.invalidate()
+            current_app.logger.info(f"Renamed ResourceType(id={type_id})")
         except IntegrityError:
             db.session.rollback()
             flash(f"Type '{new_name}' already exists.", "warning")
     return redirect(url_for('list_types'))
 
-@app.route('/types/delete/<int:type_id>', methods=['POST'])
+@views.route('/types/delete/<int:type_id>', methods=['POST'])
 def delete_type(type_id):
     t = ResourceType.query.get_or_404(type_id)
+    # Deleting a type deletes its resources (and their assignments).
+    events.record_event(None, 'type_deleted', type_id=type_id)
     db.session.delete(t)
+    bump_revision(LOOKUPS_KEY)
     db.session.commit()
-    app.logger.info(f"Deleted ResourceType(id={type_id})")
+    lookup_cache.invalidate()
+    current_app.logger.info(f"Deleted ResourceType(id={type_id})")
     return redirect(url_for('list_types'))
 
 # ─── Resource Group CRUD ─────────────────────────────────────────────────
-@app.route('/groups')
+@views.route('/groups')
+@revision_etag(lambda: [LOOKUPS_KEY])
 def list_groups():
-    gs = ResourceGroup.query.order_by(ResourceGroup.name).all()
+    _, gs = queries.filter_options()
     return render_template('groups.html', groups=gs)
 
-@app.route('/groups', methods=['POST'])
+@views.route('/groups', methods=['POST'])
 def add_group():
     name = request.form.get('name')
     if not name:
@@ -248,53 +482,74 @@ def add_group():
     g = ResourceGroup(name=name)
     db.session.add(g)
     try:
+        bump_revision(LOOKUPS_KEY)
         db.session.commit()
-        app.logger.info(f"Added ResourceGroup(id={g.id})")
+        lookup_cache.invalidate()
+        current_app.logger.info(f"Added ResourceGroup(id={g.id})")
     except IntegrityError:
         db.session.rollback()
         flash(f"Group '{name}' already exists.", "warning")
     return redirect(url_for('list_groups'))
 
-@app.route('/groups/edit/<int:group_id>', methods=['POST'])
+@views.route('/groups/edit/<int:group_id>', methods=['POST'])
 def edit_group(group_id):
     new_name = request.form.get('name')
     g = ResourceGroup.query.get_or_404(group_id)
     if new_name:
         g.name = new_name
+        events.record_event(None, 'group_renamed', group={'id': g.id, 'name': g.name})
         try:
+            bump_revision(LOOKUPS_KEY)
             db.session.commit()
-            app.logger.info(f"Renamed ResourceGroup(id={group_id})")
+            lookup_cache.invalidate()
+            current_app.logger.info(f"Renamed ResourceGroup(id={group_id})")
         except IntegrityError:
             db.session.rollback()
             flash(f"Group '{new_name}' already exists.", "warning")
     return redirect(url_for('list_groups'))
 
-@app.route('/groups/delete/<int:group_id>', methods=['POST'])
+@views.route('/groups/delete/<int:group_id>', methods=['POST'])
 def delete_group(group_id):
     g = ResourceGroup.query.get_or_404(group_id)
+    # Deleting a group deletes its resources (and their assignments).
+    events.record_event(None, 'group_deleted', group_id=group_id)
     db.session.delete(g)
+    bump_revision(LOOKUPS_KEY)
     db.session.commit()
-    app.logger.info(f"Deleted ResourceGroup(id={group_id})")
+    lookup_cache.invalidate()
+    current_app.logger.info(f"Deleted ResourceGroup(id={group_id})")
     return redirect(url_for('list_groups'))
 
 # ─── Resource CRUD ─────────────────────────────────────────────────────
-@app.route('/resources')
+@views.route('/resources')
+@revision_etag(lambda: [LOOKUPS_KEY])
 def list_resources():
-    rs = Resource.query.order_by(Resource.name).all()
-    ts = ResourceType.query.order_by(ResourceType.name).all()
-    gs = ResourceGroup.query.order_by(ResourceGroup.name).all()
+    lookups = lookup_cache.snapshot()
+    ts, gs  = lookups.types, lookups.groups
+    rs, rs_next = queries.resources_page()
     types_data  = [{'id': t.id, 'name': t.name} for t in ts]
     groups_data = [{'id': g.id, 'name': g.name} for g in gs]
     return render_template(
         'resources.html',
         resources=rs,
+        resources_next=rs_next,
         types=ts,
         groups=gs,
         types_data=types_data,
         groups_data=groups_data
     )
 
-@app.route('/resources', methods=['POST'])
+def resource_payload(r):
+    """Resource fields as the live board shows them (names read in this transaction)."""
+    t = db.session.get(ResourceType, r.type_id) if r.type_id else None
+    grp = db.session.get(ResourceGroup, r.group_id) if r.group_id else None
+    return {
+        'id': r.id, 'name': r.name,
+        'type_id': r.type_id,   'type_name': t.name if t else None,
+        'group_id': r.group_id, 'group_name': grp.name if grp else None,
+    }
+
+@views.route('/resources', methods=['POST'])
 def add_resource():
     name     = request.form.get('name')
     type_id  = request.form.get('type_id', type=int)
@@ -306,11 +561,15 @@ def add_resource():
             group_id=group_id or None
         )
         db.session.add(r)
+        bump_revision(LOOKUPS_KEY)
+        events.record_event(None, 'resource_added',
+                            resource={**resource_payload(r), 'remaining': queries.FULL_CAPACITY})
         db.session.commit()
-        app.logger.info(f"Added Resource(id={r.id})")
+        lookup_cache.invalidate()
+        current_app.logger.info(f"Added Resource(id={r.id})")
     return redirect(url_for('list_resources'))
 
-@app.route('/resources/edit/<int:resource_id>', methods=['POST'])
+@views.route('/resources/edit/<int:resource_id>', methods=['POST'])
 def edit_resource(resource_id):
     r = Resource.query.get_or_404(resource_id)
     new_name  = request.form.get('name')
@@ -320,21 +579,212 @@ def edit_resource(resource_id):
         r.name = new_name
     r.type_id  = new_type or None
     r.group_id = new_group or None
+    bump_revision(LOOKUPS_KEY)
+    events.record_event(None, 'resource_updated', resource=resource_payload(r))
     db.session.commit()
-    app.logger.info(f"Updated Resource(id={resource_id})")
+    lookup_cache.invalidate()
+    current_app.logger.info(f"Updated Resource(id={resource_id})")
     return redirect(url_for('list_resources'))
 
-@app.route('/resources/delete/<int:resource_id>', methods=['POST'])
+@views.route('/resources/delete/<int:resource_id>', methods=['POST'])
 def delete_resource(resource_id):
     r = Resource.query.get_or_404(resource_id)
     db.session.delete(r)
+    bump_revision(LOOKUPS_KEY)
+    events.record_event(None, 'resource_deleted', resource_id=resource_id)
     db.session.commit()
-    app.logger.info(f"Deleted Resource(id={resource_id})")
+    lookup_cache.invalidate()
+    current_app.logger.info(f"Deleted Resource(id={resource_id})")
     return redirect(url_for('list_resources'))
 
-# ─── Ensure tables exist & run ─────────────────────────────────────────
-with app.app_context():
-    db.create_all()
+# ─── JSON Read APIs ────────────────────────────────────────────────────
+@views.route('/api/sprints')
+@revision_etag(lambda: [SPRINTS_KEY], variant='json')
+def api_sprints():
+    sprints = Sprint.query.order_by(Sprint.id).all()
+    return jsonify(sprints=[{'id': s.id, 'name': s.name} for s in sprints])
+
+@views.route('/api/sprints/<int:sprint_id>')
+@revision_etag(sprint_keys, variant='json')
+def api_sprint(sprint_id):
+    sprint = queries.sprint_board(sprint_id)
+    return jsonify(
+        id=sprint.id,
+        name=sprint.name,
+        revision=get_revision(sprint_key(sprint_id)),
+        projects=[{
+            'id': p.id,
+            'name': p.name,
+            'assignments': [
+                {'id': a.id, 'resource_id': a.resource_id, 'capacity': a.capacity}
+                for a in p.assignments
+            ]
+        } for p in sprint.projects],
+        # The resource pool is paginated; fetch it page by page from here.
+        pool=url_for('api_pool', sprint_id=sprint_id)
+    )
+
+def int_list_arg(name):
+    """Parse a comma-separated query argument into ints (ValueError if malformed)."""
+    raw = request.args.get(name, '')
+    return [int(x) for x in raw.split(',') if x.strip()]
+
+def int_arg(name):
+    """Parse an optional integer query argument (ValueError if malformed)."""
+    raw = request.args.get(name, '').strip()
+    return int(raw) if raw else None
+
+def page_args():
+    """Filter and keyset arguments shared by the paginated resource APIs."""
+    after_name = request.args.get('after_name')
+    after_id   = int_arg('after_id')
+    if (after_name is None) != (after_id is None):
+        raise ValueError("'after_name' and 'after_id' go together")
+    return {
+        'type_ids':  int_list_arg('type_ids'),
+        'group_ids': int_list_arg('group_ids'),
+        'prefix':    request.args.get('q', '').strip() or None,
+        'after':     (after_name, after_id) if after_name is not None and after_id is not None else None,
+        'limit':     int(request.args.get('limit') or queries.PAGE_SIZE),
+    }
+
+PAGE_ARGS_ERROR = ("'type_ids', 'group_ids', 'after_id' and 'limit' must be integers, "
+                   "and 'after_name' needs 'after_id'")
+
+@views.route('/api/resources')
+@revision_etag(lambda: [LOOKUPS_KEY], variant='json')
+def api_resources():
+    try:
+        args = page_args()
+    except ValueError:
+        return jsonify(success=False, error=PAGE_ARGS_ERROR), 400
+    rs, cursor = queries.resources_page(**args)
+    return jsonify(resources=rs, next=cursor)
+
+@views.route('/api/sprints/<int:sprint_id>/pool')
+@revision_etag(sprint_keys, variant='pool')
+def api_pool(sprint_id):
+    try:
+        args = page_args()
+    except ValueError:
+        return jsonify(success=False, error=PAGE_ARGS_ERROR), 400
+    pool, cursor = queries.pool_page(sprint_id, **args)
+    return jsonify(resources=pool, next=cursor)
+
+@views.route('/api/types')
+@revision_etag(lambda: [LOOKUPS_KEY], variant='json')
+def api_types():
+    ts, _ = queries.filter_options()
+    return jsonify(types=[{'id': t.id, 'name': t.name} for t in ts])
+
+@views.route('/api/groups')
+@revision_etag(lambda: [LOOKUPS_KEY], variant='json')
+def api_groups():
+    _, gs = queries.filter_options()
+    return jsonify(groups=[{'id': g.id, 'name': g.name} for g in gs])
+
+@views.route('/api/capacity')
+def api_capacity():
+    try:
+        sprint_ids = int_list_arg('sprint_ids')
+    except ValueError:
+        return jsonify(success=False, error="'sprint_ids' must be a comma-separated list of integers"), 400
+    return jsonify(capacity_matrix(sprint_ids or None))
+
+# ─── Export ────────────────────────────────────────────────────────────
+@views.route('/export/assignments.<any(csv, ndjson):fmt>')
+def export_assignments(fmt):
+    try:
+        query = export.export_query(
+            sprint_ids  = int_list_arg('sprint_ids'),
+            from_sprint = int_arg('from_sprint'),
+            to_sprint   = int_arg('to_sprint'),
+            type_ids    = int_list_arg('type_ids'),
+            group_ids   = int_list_arg('group_ids'),
+        )
+    except ValueError:
+        return jsonify(success=False, error="id filters must be integers or comma-separated lists of integers"), 400
+    stream, mimetype = export.FORMATS[fmt]
+    current_app.logger.info(f"Streaming {fmt} export")
+    return Response(
+        stream_with_context(stream(query)),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=assignments.{fmt}'}
+    )
+
+@views.route('/api/cache')
+def api_cache_stats():
+    return jsonify(lookups=lookup_cache.stats())
+
+# ─── Import ────────────────────────────────────────────────────────────
+def run_import(kind, rows):
+    """Import `rows` of `kind`, commit the valid ones and return the report."""
+    job    = importer.Importer(kind)
+    report = job.run(rows)
+    if kind == 'assignments':
+        for sid in job.sprint_ids:
+            revision = bump_revision(sprint_key(sid))
+            events.record_event(sid, 'reload', revision=revision)
+    else:
+        bump_revision(LOOKUPS_KEY)
+        if kind == 'resources':
+            events.record_event(None, 'reload')
+    db.session.commit()
+    if kind != 'assignments':
+        lookup_cache.invalidate()
+    current_app.logger.info(
+        f"Imported {kind}: {report['inserted']} inserted, "
+        f"{report['updated']} updated, {len(report['errors'])} errors"
+    )
+    return report
+
+def guess_format(filename, mimetype):
+    fmt = request.args.get('format')
+    if not fmt and filename:
+        fmt = filename.rsplit('.', 1)[-1].lower()
+    if not fmt:
+        fmt = 'ndjson' if 'ndjson' in (mimetype or '') else 'csv'
+    return fmt
+
+@views.route('/import/<any(types, groups, resources, assignments):kind>', methods=['POST'])
+def import_data(kind):
+    upload = request.files.get('file')
+    if upload:
+        stream, fmt = upload.stream, guess_format(upload.filename, upload.mimetype)
+    else:
+        stream, fmt = request.stream, guess_format(None, request.mimetype)
+    if fmt not in importer.FORMATS:
+        return jsonify(success=False, error=f"format must be one of {', '.join(importer.FORMATS)}"), 400
+    try:
+        report = run_import(kind, importer.read_rows(stream, fmt))
+    except importer.ImportFormatError as e:
+        db.session.rollback()
+        return jsonify(success=False, error=str(e)), 400
+    return jsonify(success=not report['errors'], **report)
+
+@click.command('import')
+@click.argument('kind', type=click.Choice(importer.KINDS))
+@click.argument('source', type=click.File('rb'))
+@click.option('--format', 'fmt', type=click.Choice(importer.FORMATS),
+              help="Defaults to the file extension.")
+@with_appcontext
+def import_command(kind, source, fmt):
+    """Import KIND records from a CSV or NDJSON SOURCE file ('-' for stdin)."""
+    fmt = fmt or ('ndjson' if source.name.endswith('.ndjson') else 'csv')
+    try:
+        report = run_import(kind, importer.read_rows(source, fmt))
+    except importer.ImportFormatError as e:
+        db.session.rollback()
+        raise click.ClickException(str(e))
+    click.echo(json.dumps(report, indent=2))
+
+# ─── Schema ────────────────────────────────────────────────────────────
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    """Create missing tables and indexes (safe to re-run after upgrades)."""
+    init_schema()
+    click.echo("Database schema is up to date.")
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    create_app().run(debug=True)
@@ -0,0 +1,167 @@
+# assignments.py
+"""
+Batched assignment writes.
+
+`apply_bulk` validates a list of assign / unassign / capacity operations
+against the sprint's current per-resource totals (one grouped query),
+then flushes every change as at most one INSERT, one DELETE and one
+UPDATE batch inside the caller's transaction.
+
+Callers bump the sprint's revision before validating. That UPDATE locks
+the revision row (on SQLite it takes the database write lock), so
+concurrent writers to one sprint run one after another and a capacity
+check never reads totals another request is about to change.
+"""
+from collections import defaultdict
+
+from sqlalchemy import insert, delete, update
+
+from models import db, Project, Resource, Assignment
+from queries import FULL_CAPACITY, used_capacity_subquery
+
+OPS = ('assign', 'unassign', 'capacity')
+
+
+class BulkError(ValueError):
+    """Raised for a single operation that cannot be applied."""
+
+
+def as_int(value, field):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise BulkError(f"'{field}' must be an integer")
+
+
+def parse_operation(op):
+    if not isinstance(op, dict):
+        raise BulkError("operation must be an object")
+    kind = op.get('op')
+    if kind not in OPS:
+        raise BulkError(f"'op' must be one of {', '.join(OPS)}")
+    parsed = {
+        'op':          kind,
+        'project_id':  as_int(op.get('project_id'), 'project_id'),
+        'resource_id': as_int(op.get('resource_id'), 'resource_id'),
+    }
+    if kind != 'unassign':
+        capacity = as_int(op.get('capacity', FULL_CAPACITY), 'capacity')
+        if not 0 < capacity <= FULL_CAPACITY:
+            raise BulkError(f"'capacity' must be between 1 and {FULL_CAPACITY}")
+        parsed['capacity'] = capacity
+    return parsed
+
+
+def known_ids(sprint_id, pids, rids):
+    """(ids in `pids` that are projects of the sprint, ids in `rids` that are resources)."""
+    valid_pids = {pid for (pid,) in db.session.query(Project.id)
+                  .filter(Project.sprint_id == sprint_id, Project.id.in_(pids))} if pids else set()
+    valid_rids = {rid for (rid,) in db.session.query(Resource.id)
+                  .filter(Resource.id.in_(rids))} if rids else set()
+    return valid_pids, valid_rids
+
+
+def reference_error(sprint_id, project_id, resource_id, valid_pids, valid_rids):
+    if project_id not in valid_pids:
+        return f"Project(id={project_id}) not found in Sprint(id={sprint_id})"
+    if resource_id not in valid_rids:
+        return f"Resource(id={resource_id}) not found"
+    return None
+
+
+def apply_bulk(sprint_id, operations):
+    """
+    Validate and stage `operations` for `sprint_id`.
+
+    Returns (results, ok). `results` holds one dict per input operation.
+    When `ok` is False nothing has been written and the caller should
+    roll back; otherwise the changes are flushed but not committed.
+    """
+    results = [None] * len(operations)
+    parsed  = {}
+    for i, op in enumerate(operations):
+        try:
+            parsed[i] = parse_operation(op)
+        except BulkError as e:
+            results[i] = {'index': i, 'success': False, 'error': str(e)}
+
+    pids = {p['project_id'] for p in parsed.values()}
+    rids = {p['resource_id'] for p in parsed.values()}
+
+    # Reference data and current totals: a fixed number of set-based reads.
+    valid_pids, valid_rids = known_ids(sprint_id, pids, rids)
+    totals = defaultdict(int)
+    rows   = defaultdict(list)
+    if rids:
+        used = used_capacity_subquery(sprint_id)
+        for rid, total in db.session.query(used.c.resource_id, used.c.used).filter(used.c.resource_id.in_(rids)):
+            totals[rid] = int(total or 0)
+        existing = (db.session.query(Assignment.id, Assignment.project_id, Assignment.resource_id, Assignment.capacity)
+                    .filter(Assignment.sprint_id == sprint_id,
+                            Assignment.project_id.in_(pids),
+                            Assignment.resource_id.in_(rids))
+                    .order_by(Assignment.id))
+        for aid, pid, rid, cap in existing:
+            rows[(pid, rid)].append({'id': aid, 'capacity': cap})
+
+    inserts, deletes, updates = [], set(), {}
+    for i, p in sorted(parsed.items()):
+        pid, rid, key = p['project_id'], p['resource_id'], (p['project_id'], p['resource_id'])
+        result = {'index': i, 'op': p['op'], 'project_id': pid, 'resource_id': rid}
+        error  = reference_error(sprint_id, pid, rid, valid_pids, valid_rids)
+        if error:
+            pass
+        elif p['op'] == 'assign':
+            if totals[rid] + p['capacity'] > FULL_CAPACITY:
+                error = f"Resource(id={rid}) has only {FULL_CAPACITY - totals[rid]}% left"
+            else:
+                row = {'id': None, 'capacity': p['capacity'], 'key': key}
+                rows[key].append(row)
+                inserts.append(row)
+                totals[rid] += p['capacity']
+        elif not rows[key]:
+            error = f"Resource(id={rid}) is not assigned to Project(id={pid})"
+        elif p['op'] == 'unassign':
+            row = rows[key].pop(0)
+            totals[rid] -= row['capacity']
+            if row['id'] is None:
+                inserts.remove(row)
+            else:
+                deletes.add(row['id'])
+                updates.pop(row['id'], None)
+        else:
+            row   = rows[key][0]
+            delta = p['capacity'] - row['capacity']
+            if totals[rid] + delta > FULL_CAPACITY:
+                error = f"Resource(id={rid}) has only {FULL_CAPACITY - totals[rid] + row['capacity']}% left"
+            else:
+                row['capacity'] = p['capacity']
+                totals[rid] += delta
+                if row['id'] is not None:
+                    updates[row['id']] = p['capacity']
+        if error:
+            result.update(success=False, error=error)
+        else:
+            result.update(success=True, remaining=FULL_CAPACITY - totals[rid])
+        results[i] = result
+
+    ok = all(r['success'] for r in results)
+    if not ok:
+        return results, False
+
+    if inserts:
+        db.session.execute(insert(Assignment), [
+            {'sprint_id': sprint_id, 'project_id': row['key'][0],
+             'resource_id': row['key'][1], 'capacity': row['capacity']}
+            for row in inserts
+        ])
+    if deletes:
+        db.session.execute(
+            delete(Assignment).where(Assignment.id.in_(deletes)),
+            execution_options={'synchronize_session': False}
+        )
+    if updates:
+        db.session.execute(update(Assignment), [
+            {'id': aid, 'capacity': cap} for aid, cap in updates.items()
+        ])
+    return results, True
@@ -0,0 +1,11 @@
+# bench/__init__.py
+"""
+Load and benchmark suite for the capacity planner.
+
+    python -m bench run --scale medium --out bench/baseline.json
+    python -m bench compare bench/baseline.json --scale medium
+
+`dataset` seeds a reproducible synthetic planning database, `harness`
+drives the key routes through the Flask test client and records
+p50/p95 latency, SQL statement count and peak Python memory per route.
+"""
@@ -0,0 +1,86 @@
+# bench/__main__.py
+"""Command line entry point: `python -m bench run|compare ...`."""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+
+
+def _app(db_path, scale, seed):
+    """Import the app against a dedicated SQLite file, seeding it on first use."""
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.abspath(db_path)}"
+    logging.disable(logging.INFO)
+    from app import app
+    from models import db, init_schema, Sprint
+    from bench import dataset
+
+    with app.app_context():
+        init_schema()
+        if not db.session.query(Sprint.id).first():
+            written = dataset.generate(scale, seed=seed)
+            print(f"Seeded {scale} dataset: {written} assignments", file=sys.stderr)
+    return app
+
+
+def _measure(args):
+    from bench import harness
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix='cp-bench-'), 'bench.db')
+    app = _app(db_path, args.scale, args.seed)
+    results = harness.run(app, iterations=args.iterations, warmup=args.warmup)
+    return harness.report(results, args.scale, args.seed, args.iterations)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bench')
+    sub = parser.add_subparsers(dest='command', required=True)
+    for name in ('run', 'compare'):
+        p = sub.add_parser(name)
+        p.add_argument('--scale', default='small', choices=('tiny', 'small', 'medium', 'large'))
+        p.add_argument('--seed', type=int, default=1)
+        p.add_argument('--iterations', type=int, default=20)
+        p.add_argument('--warmup', type=int, default=2)
+        p.add_argument('--db', help="SQLite file to reuse (seeded if empty); defaults to a temp file")
+        if name == 'run':
+            p.add_argument('--out', help="write the JSON report here instead of stdout")
+        else:
+            p.add_argument('baseline', help="JSON report from a previous `run`")
+            p.add_argument('--threshold', type=float, default=None,
+                           help="allowed relative slowdown, e.g. 0.2 for 20%%")
+    args = parser.parse_args(argv)
+
+    from bench import harness
+    if args.command == 'compare':
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline['meta']['scale'] != args.scale:
+            parser.error(f"baseline was recorded at scale '{baseline['meta']['scale']}'")
+
+    current = _measure(args)
+    if args.command == 'run':
+        text = json.dumps(current, indent=2, sort_keys=True)
+        if args.out:
+            with open(args.out, 'w') as f:
+                f.write(text + '\n')
+        else:
+            print(text)
+        return 0
+
+    threshold   = harness.DEFAULT_THRESHOLD if args.threshold is None else args.threshold
+    regressions = harness.compare(baseline['routes'], current['routes'], threshold)
+    for name, stats in sorted(current['routes'].items()):
+        base = baseline['routes'].get(name, {})
+        print(f"{name:20s} p50 {stats['p50_ms']:8.2f} ms (was {base.get('p50_ms', float('nan')):8.2f})  "
+              f"p95 {stats['p95_ms']:8.2f} ms  queries {stats['queries']:3d}  peak {stats['peak_kb']:8.1f} KB")
+    if regressions:
+        print("\nRegressions:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
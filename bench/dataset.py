@@ -0,0 +1,69 @@
+# bench/dataset.py
+"""Seeded synthetic planning data, written with executemany inserts."""
+import random
+from collections import namedtuple
+
+from sqlalchemy import insert
+
+from models import db, Sprint, Project, ResourceType, ResourceGroup, Resource, Assignment
+
+Scale = namedtuple('Scale', 'sprints projects resources types groups density')
+
+SCALES = {
+    'tiny':   Scale(sprints=3,   projects=3,  resources=30,    types=3,  groups=2,  density=0.6),
+    'small':  Scale(sprints=10,  projects=5,  resources=200,   types=5,  groups=4,  density=0.6),
+    'medium': Scale(sprints=50,  projects=20, resources=1_000, types=8,  groups=6,  density=0.6),
+    'large':  Scale(sprints=200, projects=50, resources=5_000, types=12, groups=10, density=0.6),
+}
+
+CAPACITY_SPLITS = ((100,), (50, 50), (50, 25), (75,), (25, 25, 25), (60, 40))
+
+
+def generate(scale, seed=1):
+    """
+    Fill an empty database with `scale` (a Scale or a SCALES key).
+
+    Every sprint gets `projects` projects; each resource is assigned in a
+    sprint with probability `density`, split over one to three projects
+    without exceeding 100%. Returns the number of assignments written.
+    """
+    if isinstance(scale, str):
+        scale = SCALES[scale]
+    rng = random.Random(seed)
+
+    db.session.execute(insert(ResourceType),  [{'name': f'Type {i:03d}'}  for i in range(scale.types)])
+    db.session.execute(insert(ResourceGroup), [{'name': f'Group {i:03d}'} for i in range(scale.groups)])
+    type_ids  = [i for (i,) in db.session.query(ResourceType.id)]
+    group_ids = [i for (i,) in db.session.query(ResourceGroup.id)]
+
+    db.session.execute(insert(Resource), [
+        {'name': f'Resource {i:06d}',
+         'type_id': rng.choice(type_ids), 'group_id': rng.choice(group_ids)}
+        for i in range(scale.resources)
+    ])
+    resource_ids = [i for (i,) in db.session.query(Resource.id).order_by(Resource.id)]
+
+    db.session.execute(insert(Sprint), [{'name': f'Sprint {i:04d}'} for i in range(scale.sprints)])
+    sprint_ids = [i for (i,) in db.session.query(Sprint.id).order_by(Sprint.id)]
+    db.session.execute(insert(Project), [
+        {'name': f'Project {p:03d}', 'sprint_id': sid}
+        for sid in sprint_ids for p in range(scale.projects)
+    ])
+    projects = {}
+    for pid, sid in db.session.query(Project.id, Project.sprint_id).order_by(Project.id):
+        projects.setdefault(sid, []).append(pid)
+
+    written = 0
+    for sid in sprint_ids:
+        rows = []
+        for rid in resource_ids:
+            if rng.random() >= scale.density:
+                continue
+            for capacity in rng.choice(CAPACITY_SPLITS):
+                rows.append({'sprint_id': sid, 'project_id': rng.choice(projects[sid]),
+                             'resource_id': rid, 'capacity': capacity})
+        if rows:
+            db.session.execute(insert(Assignment), rows)
+            written += len(rows)
+    db.session.commit()
+    return written
@@ -0,0 +1,144 @@
+# bench/harness.py
+"""Drive key routes through the Flask test client and record their cost."""
+import math
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import sqlalchemy
+from sqlalchemy import event, func
+
+from models import db, Sprint, Project, Resource, Assignment
+
+DEFAULT_THRESHOLD = 0.20     # 20% slower / bigger counts as a regression
+LATENCY_SLACK_MS  = 1.0      # ignore jitter below this
+MEMORY_SLACK_KB   = 64
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def _fixtures(app):
+    """Pick a mid-range sprint, one of its projects and a resource free in it."""
+    with app.app_context():
+        sprint_ids = [i for (i,) in db.session.query(Sprint.id).order_by(Sprint.id)]
+        sid = sprint_ids[len(sprint_ids) // 2]
+        pid = db.session.query(func.min(Project.id)).filter(Project.sprint_id == sid).scalar()
+        busy = db.session.query(Assignment.resource_id).filter(Assignment.sprint_id == sid)
+        rid = (db.session.query(func.min(Resource.id))
+               .filter(Resource.id.not_in(busy)).scalar())
+        if rid is None:
+            rid = db.session.query(func.min(Resource.id)).scalar()
+        return sid, pid, rid
+
+
+def routes(app):
+    """[(name, call, before, after)]; each is a callable(client) or None."""
+    sid, pid, rid = _fixtures(app)
+    body = {'sprint_id': sid, 'project_id': pid, 'resource_id': rid, 'capacity': 10}
+    assign   = lambda c: c.post('/assign', json=body)
+    unassign = lambda c: c.post('/unassign', json=body)
+    return [
+        ('list_sprints',      lambda c: c.get('/sprints'),          None,   None),
+        ('view_sprint',       lambda c: c.get(f'/sprints/{sid}'),   None,   None),
+        ('list_resources',    lambda c: c.get('/resources'),        None,   None),
+        # assign/unassign are paired so the resource's capacity stays stable
+        ('assign_resource',   assign,                               None,   unassign),
+        ('unassign_resource', unassign,                             assign, None),
+        ('api_capacity',      lambda c: c.get('/api/capacity'),     None,   None),
+    ]
+
+
+def run(app, iterations=20, warmup=2):
+    """Return {route: {p50_ms, p95_ms, queries, peak_kb}} for every route."""
+    client     = app.test_client()
+    statements = []
+
+    def _record(*args):
+        statements.append(1)
+
+    def _once(call, before, after):
+        if before:
+            before(client)
+        statements.clear()
+        start = time.perf_counter()
+        resp  = call(client)
+        elapsed = (time.perf_counter() - start) * 1000
+        queries = len(statements)
+        if after:
+            after(client)
+        return resp, elapsed, queries
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', _record)
+    results = {}
+    try:
+        for name, call, before, after in routes(app):
+            for _ in range(warmup):
+                _once(call, before, after)
+
+            latencies, counts = [], []
+            for _ in range(iterations):
+                resp, elapsed, queries = _once(call, before, after)
+                if resp.status_code >= 400:
+                    raise RuntimeError(f"{name} returned {resp.status_code}")
+                latencies.append(elapsed)
+                counts.append(queries)
+
+            if before:
+                before(client)
+            tracemalloc.start()
+            call(client)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            if after:
+                after(client)
+
+            results[name] = {
+                'p50_ms':  round(statistics.median(latencies), 3),
+                'p95_ms':  round(_percentile(latencies, 95), 3),
+                'queries': int(statistics.median(counts)),
+                'peak_kb': round(peak / 1024, 1),
+            }
+    finally:
+        event.remove(engine, 'before_cursor_execute', _record)
+    return results
+
+
+def report(results, scale, seed, iterations):
+    return {
+        'meta': {
+            'scale':      scale,
+            'seed':       seed,
+            'iterations': iterations,
+            'python':     platform.python_version(),
+            'sqlalchemy': sqlalchemy.__version__,
+            'created':    datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        },
+        'routes': results,
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """List human-readable regressions of `current` against `baseline` route stats."""
+    regressions = []
+    for name, base in baseline.items():
+        now = current.get(name)
+        if now is None:
+            regressions.append(f"{name}: missing from current run")
+            continue
+        for key in ('p50_ms', 'p95_ms'):
+            limit = max(base[key] * (1 + threshold), base[key] + LATENCY_SLACK_MS)
+            if now[key] > limit:
+                regressions.append(f"{name}: {key} {now[key]:.1f} > {base[key]:.1f} (+{threshold:.0%})")
+        if now['queries'] > base['queries']:
+            regressions.append(f"{name}: queries {now['queries']} > {base['queries']}")
+        limit = max(base['peak_kb'] * (1 + threshold), base['peak_kb'] + MEMORY_SLACK_KB)
+        if now['peak_kb'] > limit:
+            regressions.append(f"{name}: peak_kb {now['peak_kb']:.0f} > {base['peak_kb']:.0f} (+{threshold:.0%})")
+    return regressions
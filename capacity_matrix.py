@@ -0,0 +1,99 @@
+# capacity_matrix.py
+"""
+Resources × sprints allocation matrix.
+
+One grouped aggregate over Assignment gives the non-zero
+(resource, sprint) totals; everything else (axes, type/group rollups,
+over-allocation flags) is derived in flat row-major lists, so the cost
+is linear in the number of non-zero cells. The payload is columnar:
+every table is a dict of equally long lists, and cells reference the
+axes by index rather than by id.
+"""
+from sqlalchemy import func
+
+from models import db, Sprint, Assignment
+from lookups import lookup_cache
+from queries import FULL_CAPACITY
+
+
+def _rollup(entries, key_of, resources, cells, n_sprints):
+    """Sum `cells` into one dense row per entry (plus a trailing 'none' row)."""
+    row_of = {e.id: i for i, e in enumerate(entries)}
+    none   = len(entries)
+    n_rows = none + 1
+    headcount = [0] * n_rows
+    res_row   = []
+    for r in resources:
+        row = row_of.get(key_of(r), none)
+        headcount[row] += 1
+        res_row.append(row)
+
+    used = [0] * (n_rows * n_sprints)
+    for ri, si, u in zip(cells['resource'], cells['sprint'], cells['used']):
+        used[res_row[ri] * n_sprints + si] += u
+
+    over = {'row': [], 'sprint': []}
+    for idx, u in enumerate(used):
+        row, si = divmod(idx, n_sprints)
+        if u > headcount[row] * FULL_CAPACITY:
+            over['row'].append(row)
+            over['sprint'].append(si)
+
+    return {
+        'id':        [e.id for e in entries] + [None],
+        'name':      [e.name for e in entries] + ['(none)'],
+        'headcount': headcount,
+        'used':      [used[i * n_sprints:(i + 1) * n_sprints] for i in range(n_rows)],
+        'over':      over,
+    }, res_row
+
+
+def capacity_matrix(sprint_ids=None):
+    """Build the columnar allocation payload, optionally for a subset of sprints."""
+    lookups = lookup_cache.snapshot()
+
+    sprint_q = db.session.query(Sprint.id, Sprint.name).order_by(Sprint.id)
+    if sprint_ids:
+        sprint_q = sprint_q.filter(Sprint.id.in_(sprint_ids))
+    sprints   = sprint_q.all()
+    sprint_ix = {sid: i for i, (sid, _) in enumerate(sprints)}
+
+    resources = lookups.resources
+    res_ix    = {r.id: i for i, r in enumerate(resources)}
+
+    totals = (db.session.query(Assignment.resource_id, Assignment.sprint_id, func.sum(Assignment.capacity))
+              .group_by(Assignment.resource_id, Assignment.sprint_id))
+    if sprint_ids:
+        totals = totals.filter(Assignment.sprint_id.in_(sprint_ids))
+
+    cells = {'resource': [], 'sprint': [], 'used': []}
+    over  = []
+    for rid, sid, used in totals:
+        ri, si = res_ix.get(rid), sprint_ix.get(sid)
+        if ri is None or si is None:
+            continue
+        used = int(used)
+        if used > FULL_CAPACITY:
+            over.append(len(cells['used']))
+        cells['resource'].append(ri)
+        cells['sprint'].append(si)
+        cells['used'].append(used)
+
+    n_sprints = len(sprints)
+    by_type,  type_row  = _rollup(lookups.types,  lambda r: r.type_id,  resources, cells, n_sprints)
+    by_group, group_row = _rollup(lookups.groups, lambda r: r.group_id, resources, cells, n_sprints)
+
+    return {
+        'full_capacity': FULL_CAPACITY,
+        'sprints':   {'id': [s[0] for s in sprints], 'name': [s[1] for s in sprints]},
+        'resources': {
+            'id':    [r.id for r in resources],
+            'name':  [r.name for r in resources],
+            'type':  type_row,
+            'group': group_row,
+        },
+        'cells':          cells,
+        'over_allocated': over,
+        'by_type':        by_type,
+        'by_group':       by_group,
+    }
@@ -0,0 +1,46 @@
+# etags.py
+"""
+Revision-based conditional GET.
+
+`revision_etag` builds a weak ETag from Revision counters before the view
+runs, so an unchanged page is answered with 304 without touching the
+heavy queries or the template.
+"""
+from functools import wraps
+
+from flask import request, session, make_response
+
+from models import get_revisions
+
+
+def etag_for(keys, variant=''):
+    revisions = get_revisions(keys)
+    tag = '.'.join(f"{k}={revisions[k]}" for k in keys)
+    return f"{variant}:{tag}" if variant else tag
+
+
+def revision_etag(keys_for, variant=''):
+    """
+    Decorate a GET view with ETag / If-None-Match handling.
+
+    `keys_for(**view_args)` returns the Revision keys the response depends
+    on; `variant` distinguishes representations (e.g. 'json') sharing keys.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(**view_args):
+            # A pending flash message must be rendered, so never short-circuit it.
+            if session.get('_flashes'):
+                return view(**view_args)
+            etag = etag_for(keys_for(**view_args), variant)
+            if request.if_none_match.contains_weak(etag):
+                resp = make_response('', 304)
+            else:
+                resp = make_response(view(**view_args))
+                if resp.status_code != 200:
+                    return resp
+            resp.set_etag(etag, weak=True)
+            resp.headers['Cache-Control'] = 'no-cache'
+            return resp
+        return wrapped
+    return decorator
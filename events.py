@@ -0,0 +1,322 @@
+# events.py
+"""
+Live sprint-board updates over Server-Sent Events.
+
+Write routes call `record_event()` inside their transaction. The event
+is stored as a `SprintEvent` row, so it exists only if the change
+commits, and is handed to the worker's broker after the commit. Each
+worker has one broker holding the queues of all its SSE clients:
+
+    Broker          – fans out the events committed by this process;
+                      enough when a single worker serves the app.
+    DatabaseBroker  – one background thread per worker polls the
+                      sprint_event table and fans out events committed
+                      by any worker. Transactions commit out of id
+                      order, so an id skipped by a poll stays open for
+                      EVENTS_GAP_TIMEOUT seconds before it is given up
+                      on as rolled back.
+
+Event ids double as SSE ids, so a reconnecting EventSource sends
+`Last-Event-ID` and the stream replays what it missed from the table.
+Events with a NULL sprint_id (resource changes) go to every board.
+
+An open stream holds one worker thread for as long as the tab is open.
+EVENTS_MAX_STREAMS caps streams per worker so the remaining threads stay
+free for ordinary requests. A client over the cap gets an empty stream
+with a long `retry:`, so its EventSource comes back later and replays
+whatever it missed.
+
+Config:
+    EVENTS_BACKEND        – 'database' (default) or 'local'
+    EVENTS_POLL_INTERVAL  – DatabaseBroker poll period in seconds (default 1.0)
+    EVENTS_GAP_TIMEOUT    – seconds DatabaseBroker waits for a skipped id (default 60)
+    EVENTS_KEEPALIVE      – seconds between keep-alive comments (default 15)
+    EVENTS_RETAIN         – recent events kept for replay (default 10000)
+    EVENTS_MAX_STREAMS    – open streams per worker (default 16; keep it
+                            below gunicorn's `threads`)
+"""
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from collections import namedtuple, defaultdict
+
+from flask import Response, current_app, has_app_context
+from sqlalchemy import event, func, or_
+from sqlalchemy.orm import Session
+
+from models import db, SprintEvent
+
+log = logging.getLogger(__name__)
+
+Event = namedtuple('Event', 'id sprint_id kind payload')
+
+PRUNE_EVERY = 500     # prune old rows whenever an event id crosses a multiple of this
+QUEUE_SIZE  = 1000    # per-client backlog before the client is told to reload
+BUSY_RETRY  = (15_000, 45_000)   # ms before a client turned away at the cap reconnects
+
+_PENDING = 'sprint_events'
+_READY   = 'sprint_events_ready'
+
+
+def record_event(sprint_id, kind, **data):
+    """Stage an event in the current transaction; it is published after commit."""
+    row = SprintEvent(sprint_id=sprint_id, kind=kind, payload=json.dumps(data))
+    db.session.add(row)
+    db.session.info.setdefault(_PENDING, []).append(row)
+
+
+def latest_id():
+    return db.session.query(func.max(SprintEvent.id)).scalar() or 0
+
+
+def format_event(ev):
+    return f"id: {ev.id}\nevent: {ev.kind}\ndata: {ev.payload}\n\n"
+
+
+# ─── Transaction hooks ─────────────────────────────────────────────────
+@event.listens_for(Session, 'before_commit')
+def _collect(session):
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    session.flush()
+    ready = [Event(r.id, r.sprint_id, r.kind, r.payload) for r in pending]
+    session.info[_READY] = ready
+    crossed = [e.id for e in ready if e.id % PRUNE_EVERY == 0]
+    if crossed and has_app_context():
+        keep = current_app.config.get('EVENTS_RETAIN', 10_000)
+        (session.query(SprintEvent)
+         .filter(SprintEvent.id <= max(crossed) - keep)
+         .delete(synchronize_session=False))
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish(session):
+    ready = session.info.pop(_READY, None)
+    if ready and has_app_context():
+        live = current_app.extensions.get('events')
+        if live is not None:
+            live.broker.published(ready)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard(session, previous_transaction):
+    session.info.pop(_PENDING, None)
+    session.info.pop(_READY, None)
+
+
+# ─── Brokers ───────────────────────────────────────────────────────────
+class Subscription:
+    __slots__ = ('sprint_id', 'queue', 'overflowed')
+
+    def __init__(self, sprint_id):
+        self.sprint_id  = sprint_id
+        self.queue      = queue.Queue(maxsize=QUEUE_SIZE)
+        self.overflowed = False
+
+
+class Broker:
+    """Fans events out to the SSE clients connected to this worker."""
+
+    def __init__(self, app):
+        self.app   = app
+        self._subs = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, sprint_id, limit=None):
+        """New subscription, or None if `limit` subscriptions are already open."""
+        sub = Subscription(sprint_id)
+        with self._lock:
+            if limit is not None and sum(len(s) for s in self._subs.values()) >= limit:
+                return None
+            self._subs[sprint_id].add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            subs = self._subs.get(sub.sprint_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subs[sub.sprint_id]
+
+    def subscribers(self):
+        with self._lock:
+            return sum(len(s) for s in self._subs.values())
+
+    def dispatch(self, events):
+        with self._lock:
+            by_sprint = {sid: list(subs) for sid, subs in self._subs.items()}
+        everyone = [sub for subs in by_sprint.values() for sub in subs]
+        for ev in events:
+            for sub in (everyone if ev.sprint_id is None else by_sprint.get(ev.sprint_id, ())):
+                try:
+                    sub.queue.put_nowait(ev)
+                except queue.Full:
+                    sub.overflowed = True
+
+    def published(self, events):
+        """Called after a commit in this process with the events it recorded."""
+        self.dispatch(events)
+
+
+class DatabaseBroker(Broker):
+    """Polls sprint_event from a single thread per worker."""
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.poll_interval = app.config['EVENTS_POLL_INTERVAL']
+        self.gap_timeout   = app.config['EVENTS_GAP_TIMEOUT']
+        self._wake   = threading.Event()
+        self._floor  = None        # every id <= floor has been dispatched or given up on
+        self._top    = None        # highest id seen
+        self._recent = set()       # dispatched ids above floor
+        self._gaps   = {}          # skipped id -> monotonic time it was first skipped
+        self._pid    = None
+        self._start_lock = threading.Lock()
+
+    def subscribe(self, sprint_id, limit=None):
+        self.start()
+        return super().subscribe(sprint_id, limit)
+
+    def start(self):
+        # Threads do not survive fork(); each worker starts its own poller.
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            if self._floor is None:
+                # Set before the first client subscribes, so its replay and the
+                # poller overlap rather than leave a gap.
+                self._floor = self._top = latest_id()
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name='sprint-events', daemon=True).start()
+
+    def published(self, events):
+        # Other workers only see them on their next poll.
+        self._wake.set()
+
+    def _run(self):
+        while self._pid == os.getpid():
+            try:
+                self.poll()
+            except Exception:
+                log.exception("Polling sprint events failed")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def poll(self):
+        """Dispatch every event committed since the previous poll."""
+        with self.app.app_context():
+            if self._floor is None:
+                self._floor = self._top = latest_id()
+                return
+            new = [i for (i,) in db.session.query(SprintEvent.id).filter(SprintEvent.id > self._floor)
+                   if i not in self._recent]
+            rows = []
+            if new:
+                rows = (db.session.query(SprintEvent.id, SprintEvent.sprint_id, SprintEvent.kind, SprintEvent.payload)
+                        .filter(SprintEvent.id.in_(new))
+                        .order_by(SprintEvent.id)
+                        .all())
+        self.dispatch([Event(*row) for row in rows])
+
+        now = time.monotonic()
+        self._recent.update(new)
+        for i in new:
+            self._gaps.pop(i, None)
+        if new and max(new) > self._top:
+            # Ids skipped on the way up belong to transactions that have not
+            # committed yet, or never will.
+            seen = set(new)
+            for i in range(self._top + 1, max(new)):
+                if i not in seen:
+                    self._gaps[i] = now
+            self._top = max(new)
+        # A gap still open after the timeout was rolled back.
+        self._gaps = {i: t for i, t in self._gaps.items() if now - t < self.gap_timeout}
+        self._floor  = min(self._gaps) - 1 if self._gaps else self._top
+        self._recent = {i for i in self._recent if i > self._floor}
+
+
+BACKENDS = {'local': Broker, 'database': DatabaseBroker}
+
+
+# ─── Flask extension ───────────────────────────────────────────────────
+class LiveEvents:
+    def __init__(self, app=None):
+        self._broker = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('EVENTS_BACKEND', os.environ.get('EVENTS_BACKEND', 'database'))
+        app.config.setdefault('EVENTS_POLL_INTERVAL', 1.0)
+        app.config.setdefault('EVENTS_GAP_TIMEOUT', 60)
+        app.config.setdefault('EVENTS_KEEPALIVE', 15)
+        app.config.setdefault('EVENTS_RETAIN', 10_000)
+        app.config.setdefault('EVENTS_MAX_STREAMS', int(os.environ.get('EVENTS_MAX_STREAMS', 16)))
+        self.app = app
+        app.extensions['events'] = self
+
+    @property
+    def broker(self):
+        """The worker's broker, created on first use from EVENTS_BACKEND."""
+        backend = BACKENDS[self.app.config['EVENTS_BACKEND']]
+        if type(self._broker) is not backend:
+            self._broker = backend(self.app)
+        return self._broker
+
+    def replay(self, sprint_id, last_event_id):
+        """Events after `last_event_id` for the sprint, or None if some were pruned."""
+        oldest = db.session.query(func.min(SprintEvent.id)).scalar()
+        if oldest is not None and last_event_id + 1 < oldest:
+            return None
+        rows = (db.session.query(SprintEvent.id, SprintEvent.sprint_id, SprintEvent.kind, SprintEvent.payload)
+                .filter(SprintEvent.id > last_event_id,
+                        or_(SprintEvent.sprint_id == sprint_id, SprintEvent.sprint_id.is_(None)))
+                .order_by(SprintEvent.id)
+                .all())
+        return [Event(*row) for row in rows]
+
+    def stream(self, sprint_id, last_event_id=None):
+        """text/event-stream response for one board; never touches the DB once streaming."""
+        headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        broker = self.broker
+        sub = broker.subscribe(sprint_id, limit=current_app.config['EVENTS_MAX_STREAMS'])
+        if sub is None:
+            log.warning("Live stream for Sprint(id=%s) turned away: %d streams open",
+                        sprint_id, broker.subscribers())
+            return Response(f"retry: {random.randint(*BUSY_RETRY)}\n\n",
+                            mimetype='text/event-stream', headers=headers)
+        backlog = self.replay(sprint_id, last_event_id) if last_event_id is not None else []
+        keepalive = current_app.config['EVENTS_KEEPALIVE']
+
+        def generate():
+            try:
+                yield "retry: 3000\n\n"
+                if backlog is None:
+                    yield "event: reload\ndata: {}\n\n"
+                    return
+                replayed = {ev.id for ev in backlog}
+                for ev in backlog:
+                    yield format_event(ev)
+                while not sub.overflowed:
+                    try:
+                        ev = sub.queue.get(timeout=keepalive)
+                    except queue.Empty:
+                        yield ": keepalive\n\n"
+                        continue
+                    if ev.id not in replayed:
+                        yield format_event(ev)
+                # Too far behind to catch up event by event.
+                yield "event: reload\ndata: {}\n\n"
+            finally:
+                broker.unsubscribe(sub)
+
+        return Response(generate(), mimetype='text/event-stream', headers=headers)
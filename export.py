@@ -0,0 +1,92 @@
+# export.py
+"""
+Streaming export of assignments.
+
+Rows come from a single joined SELECT executed with `yield_per`, which
+uses a server-side cursor where the driver supports one, and are encoded
+into CSV or NDJSON chunks as they arrive. Memory use stays flat no matter
+how many rows are exported.
+"""
+import csv
+import io
+import json
+
+from sqlalchemy import select
+
+from models import db, Sprint, Project, Resource, ResourceType, ResourceGroup, Assignment
+
+YIELD_PER  = 1000
+CHUNK_ROWS = 500
+
+COLUMNS = (
+    'sprint_id', 'sprint_name', 'project_id', 'project_name',
+    'resource_id', 'resource_name', 'type_name', 'group_name', 'capacity',
+)
+
+
+def export_query(sprint_ids=None, from_sprint=None, to_sprint=None, type_ids=None, group_ids=None):
+    """Joined SELECT of every assignment matching the filters, in board order."""
+    q = (
+        select(
+            Sprint.id, Sprint.name, Project.id, Project.name,
+            Resource.id, Resource.name, ResourceType.name, ResourceGroup.name,
+            Assignment.capacity,
+        )
+        .select_from(Assignment)
+        .join(Sprint,   Assignment.sprint_id == Sprint.id)
+        .join(Project,  Assignment.project_id == Project.id)
+        .join(Resource, Assignment.resource_id == Resource.id)
+        .outerjoin(ResourceType,  Resource.type_id == ResourceType.id)
+        .outerjoin(ResourceGroup, Resource.group_id == ResourceGroup.id)
+        .order_by(Assignment.sprint_id, Assignment.project_id, Assignment.id)
+    )
+    if sprint_ids:
+        q = q.where(Assignment.sprint_id.in_(sprint_ids))
+    if from_sprint is not None:
+        q = q.where(Assignment.sprint_id >= from_sprint)
+    if to_sprint is not None:
+        q = q.where(Assignment.sprint_id <= to_sprint)
+    if type_ids:
+        q = q.where(Resource.type_id.in_(type_ids))
+    if group_ids:
+        q = q.where(Resource.group_id.in_(group_ids))
+    return q
+
+
+def _rows(query):
+    result = db.session.execute(query.execution_options(yield_per=YIELD_PER))
+    try:
+        for partition in result.partitions():
+            yield from partition
+    finally:
+        result.close()
+
+
+def stream_csv(query):
+    buf    = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(COLUMNS)
+    for i, row in enumerate(_rows(query), 1):
+        writer.writerow(row)
+        if i % CHUNK_ROWS == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
+
+
+def stream_ndjson(query):
+    chunk = []
+    for row in _rows(query):
+        chunk.append(json.dumps(dict(zip(COLUMNS, row))))
+        if len(chunk) == CHUNK_ROWS:
+            yield '\n'.join(chunk) + '\n'
+            chunk = []
+    if chunk:
+        yield '\n'.join(chunk) + '\n'
+
+
+FORMATS = {
+    'csv':    (stream_csv,    'text/csv'),
+    'ndjson': (stream_ndjson, 'application/x-ndjson'),
+}
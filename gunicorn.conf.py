@@ -0,0 +1,22 @@
+# gunicorn.conf.py — picked up automatically by `gunicorn app:app`
+import os
+
+# Live board streams (/sprints/<id>/events) hold their connection, and one
+# thread, for as long as the tab is open. The app caps open streams per
+# worker at EVENTS_MAX_STREAMS (default 16) and tells further clients to
+# retry later, so threads - EVENTS_MAX_STREAMS threads per worker always
+# serve ordinary requests. Size for the boards open at once:
+#     workers × EVENTS_MAX_STREAMS ≥ concurrently open boards
+# and raise GUNICORN_THREADS together with EVENTS_MAX_STREAMS.
+worker_class = 'gthread'
+threads      = int(os.environ.get('GUNICORN_THREADS', 24))
+
+# Build the app once in the master and fork it; create_app() opens no
+# connections and workers drop any inherited pool after fork.
+preload_app  = True
+
+
+def worker_exit(server, worker):
+    # Drain the background log queue before the worker process goes away.
+    from log_pipeline import pipeline
+    pipeline.stop()
@@ -0,0 +1,241 @@
+# importer.py
+"""
+Chunked bulk import of types, groups, resources and sprint assignments.
+
+Rows are read lazily from CSV or NDJSON, validated against in-memory
+name → id maps loaded once per import (per chunk, for the sprints a
+chunk of assignments refers to), and written per chunk with one
+executemany INSERT and one executemany UPDATE. Existing types, groups
+and resources are matched on their unique `name`. Invalid rows are
+skipped and reported; everything else is written in the caller's
+transaction.
+"""
+import csv
+import io
+import json
+from collections import defaultdict
+
+from sqlalchemy import insert, update, func
+
+from models import db, Sprint, Project, ResourceType, ResourceGroup, Resource, Assignment
+from queries import FULL_CAPACITY
+
+CHUNK_SIZE = 1000
+KINDS      = ('types', 'groups', 'resources', 'assignments')
+FORMATS    = ('csv', 'ndjson')
+
+
+class ImportRowError(ValueError):
+    """A single row that cannot be imported."""
+
+
+class ImportFormatError(ValueError):
+    """The input as a whole cannot be read; nothing should be committed."""
+
+
+def read_rows(stream, fmt):
+    """
+    Yield dicts from a binary stream of CSV (with header) or NDJSON.
+
+    Lines that cannot become a row yield {'__error__': ...} and are
+    reported per row; input that is not UTF-8 raises ImportFormatError.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    try:
+        if fmt == 'csv':
+            yield from csv.DictReader(text)
+            return
+        for line in text:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {'__error__': f"invalid JSON: {e.msg}"}
+                continue
+            if isinstance(row, dict):
+                yield row
+            else:
+                yield {'__error__': "each line must be a JSON object"}
+    except UnicodeDecodeError as e:
+        raise ImportFormatError(f"input is not valid UTF-8 (byte {e.start})") from None
+
+
+def _chunks(rows, size):
+    chunk = []
+    for i, row in enumerate(rows, 1):
+        chunk.append((i, row))
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _text(row, field, required=True):
+    if '__error__' in row:
+        raise ImportRowError(row['__error__'])
+    value = row.get(field)
+    value = str(value).strip() if value is not None else ''
+    if required and not value:
+        raise ImportRowError(f"'{field}' is required")
+    return value or None
+
+
+def _name_map(model):
+    return dict(db.session.query(model.name, model.id))
+
+
+class Importer:
+    """Accumulates a per-row report while importing one kind of record."""
+
+    def __init__(self, kind, chunk_size=CHUNK_SIZE):
+        if kind not in KINDS:
+            raise ValueError(f"kind must be one of {', '.join(KINDS)}")
+        self.kind       = kind
+        self.chunk_size = chunk_size
+        self.inserted   = 0
+        self.updated    = 0
+        self.errors     = []
+        self.sprint_ids = set()
+
+    def report(self):
+        return {'kind': self.kind, 'inserted': self.inserted,
+                'updated': self.updated, 'errors': self.errors}
+
+    def run(self, rows):
+        handler = getattr(self, f"_import_{self.kind}")
+        handler(rows)
+        return self.report()
+
+    def _fail(self, index, error):
+        self.errors.append({'row': index, 'error': str(error)})
+
+    # ─── Types / groups ────────────────────────────────────────────────
+    def _import_names(self, model, rows):
+        known = _name_map(model)
+        for chunk in _chunks(rows, self.chunk_size):
+            new = {}
+            for i, row in chunk:
+                try:
+                    name = _text(row, 'name')
+                except ImportRowError as e:
+                    self._fail(i, e)
+                    continue
+                if name not in known:
+                    new.setdefault(name, {'name': name})
+            if new:
+                db.session.execute(insert(model), list(new.values()))
+                self.inserted += len(new)
+                known.update(db.session.query(model.name, model.id).filter(model.name.in_(new)))
+
+    def _import_types(self, rows):
+        self._import_names(ResourceType, rows)
+
+    def _import_groups(self, rows):
+        self._import_names(ResourceGroup, rows)
+
+    # ─── Resources ─────────────────────────────────────────────────────
+    def _import_resources(self, rows):
+        types, groups = _name_map(ResourceType), _name_map(ResourceGroup)
+        known = _name_map(Resource)
+        for chunk in _chunks(rows, self.chunk_size):
+            new, changed = {}, {}
+            for i, row in chunk:
+                try:
+                    name       = _text(row, 'name')
+                    type_name  = _text(row, 'type', required=False)
+                    group_name = _text(row, 'group', required=False)
+                    if type_name and type_name not in types:
+                        raise ImportRowError(f"unknown type '{type_name}'")
+                    if group_name and group_name not in groups:
+                        raise ImportRowError(f"unknown group '{group_name}'")
+                except ImportRowError as e:
+                    self._fail(i, e)
+                    continue
+                values = {'type_id': types.get(type_name), 'group_id': groups.get(group_name)}
+                if name in known:
+                    changed[known[name]] = {'id': known[name], **values}
+                else:
+                    new[name] = {'name': name, **values}
+            if new:
+                db.session.execute(insert(Resource), list(new.values()))
+                self.inserted += len(new)
+                known.update(db.session.query(Resource.name, Resource.id).filter(Resource.name.in_(new)))
+            if changed:
+                db.session.execute(update(Resource), list(changed.values()))
+                self.updated += len(changed)
+
+    # ─── Assignments ───────────────────────────────────────────────────
+    def _import_assignments(self, rows):
+        resources = _name_map(Resource)
+        projects  = {}
+        sprints   = set()
+        totals    = defaultdict(int)
+        loaded    = set()
+        for chunk in _chunks(rows, self.chunk_size):
+            # Projects and capacity totals only for the sprints this chunk names.
+            wanted = set()
+            for _, row in chunk:
+                try:
+                    wanted.add(int(str(row.get('sprint_id')).strip()))
+                except ValueError:
+                    pass
+            wanted -= loaded
+            if wanted:
+                loaded |= wanted
+                sprints.update(sid for (sid,) in db.session.query(Sprint.id).filter(Sprint.id.in_(wanted)))
+                projects.update({
+                    (sid, name): pid for pid, sid, name in
+                    db.session.query(Project.id, Project.sprint_id, Project.name)
+                    .filter(Project.sprint_id.in_(wanted))
+                })
+                totals.update({
+                    (sid, rid): int(used) for sid, rid, used in
+                    db.session.query(Assignment.sprint_id, Assignment.resource_id, func.sum(Assignment.capacity))
+                    .filter(Assignment.sprint_id.in_(wanted))
+                    .group_by(Assignment.sprint_id, Assignment.resource_id)
+                })
+            new_projects, pending = {}, []
+            for i, row in chunk:
+                try:
+                    sid      = _text(row, 'sprint_id')
+                    capacity = _text(row, 'capacity', required=False) or FULL_CAPACITY
+                    project  = _text(row, 'project')
+                    resource = _text(row, 'resource')
+                    try:
+                        sid, capacity = int(sid), int(capacity)
+                    except ValueError:
+                        raise ImportRowError("'sprint_id' and 'capacity' must be integers")
+                    if sid not in sprints:
+                        raise ImportRowError(f"unknown sprint {sid}")
+                    if resource not in resources:
+                        raise ImportRowError(f"unknown resource '{resource}'")
+                    if not 0 < capacity <= FULL_CAPACITY:
+                        raise ImportRowError(f"'capacity' must be between 1 and {FULL_CAPACITY}")
+                    rid = resources[resource]
+                    if totals[(sid, rid)] + capacity > FULL_CAPACITY:
+                        raise ImportRowError(f"resource '{resource}' has only "
+                                             f"{FULL_CAPACITY - totals[(sid, rid)]}% left in sprint {sid}")
+                except ImportRowError as e:
+                    self._fail(i, e)
+                    continue
+                totals[(sid, rid)] += capacity
+                if (sid, project) not in projects:
+                    new_projects[(sid, project)] = {'sprint_id': sid, 'name': project}
+                pending.append((sid, project, rid, capacity))
+                self.sprint_ids.add(sid)
+            if new_projects:
+                db.session.execute(insert(Project), list(new_projects.values()))
+                for pid, sid, name in (db.session.query(Project.id, Project.sprint_id, Project.name)
+                                       .filter(Project.sprint_id.in_({k[0] for k in new_projects}),
+                                               Project.name.in_({k[1] for k in new_projects}))):
+                    projects.setdefault((sid, name), pid)
+            if pending:
+                db.session.execute(insert(Assignment), [
+                    {'sprint_id': sid, 'project_id': projects[(sid, project)],
+                     'resource_id': rid, 'capacity': capacity}
+                    for sid, project, rid, capacity in pending
+                ])
+                self.inserted += len(pending)
@@ -0,0 +1,178 @@
+# instrumentation.py
+"""
+Per-request performance instrumentation.
+
+Flask request hooks time each request, events on the app's own
+SQLAlchemy engines count statements and their time, and the template signals time rendering.
+Totals are kept in plain in-process counters (one set per gunicorn
+worker) and exposed in Prometheus text format at `/metrics`. Every
+response also carries a `Server-Timing` header, and requests or
+statements over the configured thresholds are logged with their SQL
+and parameters.
+
+Config:
+    METRICS_ENABLED   – turn the whole layer off (default True)
+    SLOW_REQUEST_MS   – log requests slower than this (default 500)
+    SLOW_QUERY_MS     – log statements slower than this (default 100)
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from functools import partial
+
+from flask import (
+    g, request, current_app, has_request_context,
+    before_render_template, template_rendered, Response,
+)
+from sqlalchemy import event
+
+slow_log = logging.getLogger('capacity_planner.slow')
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)   # last slot is +Inf
+        self.sum    = 0.0
+        self.count  = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum   += value
+        self.count += 1
+
+
+class EndpointStats:
+    __slots__ = ('latency', 'sql_statements', 'sql_seconds', 'template_seconds')
+
+    def __init__(self):
+        self.latency          = Histogram()
+        self.sql_statements   = 0
+        self.sql_seconds      = 0.0
+        self.template_seconds = 0.0
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Instrumentation:
+    def __init__(self, app=None):
+        self.stats      = defaultdict(EndpointStats)
+        self.collectors = []    # callables returning extra exposition lines
+        self._lock      = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('METRICS_ENABLED', True)
+        app.config.setdefault('SLOW_REQUEST_MS', 500)
+        app.config.setdefault('SLOW_QUERY_MS', 100)
+        app.extensions['instrumentation'] = self
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+        if not app.config['METRICS_ENABLED']:
+            return
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        before_render_template.connect(self._before_render, app)
+        template_rendered.connect(self._after_render, app)
+        # Time only this app's engines (call after db.init_app), with its thresholds.
+        with app.app_context():
+            engines = list(app.extensions['sqlalchemy'].engines.values())
+        for engine in engines:
+            event.listen(engine, 'before_cursor_execute', self._before_cursor)
+            event.listen(engine, 'after_cursor_execute', partial(self._after_cursor, app.config))
+
+    # ─── Request hooks ─────────────────────────────────────────────────
+    def _before_request(self):
+        g._perf = {'start': time.perf_counter(), 'sql_n': 0, 'sql_s': 0.0, 'tpl_s': 0.0}
+
+    def _after_request(self, response):
+        perf = g.pop('_perf', None)
+        if perf is None:
+            return response
+        elapsed  = time.perf_counter() - perf['start']
+        endpoint = request.url_rule.endpoint if request.url_rule else 'unmatched'
+        with self._lock:
+            stats = self.stats[endpoint]
+            stats.latency.observe(elapsed)
+            stats.sql_statements   += perf['sql_n']
+            stats.sql_seconds      += perf['sql_s']
+            stats.template_seconds += perf['tpl_s']
+        response.headers['Server-Timing'] = (
+            f"app;dur={elapsed * 1000:.1f}, "
+            f"sql;dur={perf['sql_s'] * 1000:.1f};desc=\"{perf['sql_n']} queries\", "
+            f"tpl;dur={perf['tpl_s'] * 1000:.1f}"
+        )
+        if elapsed * 1000 >= current_app.config['SLOW_REQUEST_MS']:
+            slow_log.warning(
+                "Slow request %s %s: %.1f ms (%d queries, %.1f ms SQL, %.1f ms templates)",
+                request.method, request.full_path.rstrip('?'), elapsed * 1000,
+                perf['sql_n'], perf['sql_s'] * 1000, perf['tpl_s'] * 1000
+            )
+        return response
+
+    def _before_render(self, sender, template, context, **extra):
+        if '_perf' in g:
+            g._perf['tpl_start'] = time.perf_counter()
+
+    def _after_render(self, sender, template, context, **extra):
+        perf = g.get('_perf')
+        if perf and 'tpl_start' in perf:
+            perf['tpl_s'] += time.perf_counter() - perf.pop('tpl_start')
+
+    # ─── Engine events ─────────────────────────────────────────────────
+    def _before_cursor(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info['_perf_start'] = time.perf_counter()
+
+    def _after_cursor(self, config, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info.pop('_perf_start', time.perf_counter())
+        if has_request_context():
+            perf = g.get('_perf')
+            if perf is not None:
+                perf['sql_n'] += 1
+                perf['sql_s'] += elapsed
+        if elapsed * 1000 >= config['SLOW_QUERY_MS']:
+            slow_log.warning("Slow query (%.1f ms): %s | params=%r",
+                             elapsed * 1000, statement, parameters)
+
+    # ─── Exposition ────────────────────────────────────────────────────
+    def render(self):
+        """Prometheus text exposition of the per-endpoint counters."""
+        with self._lock:
+            snapshot = {ep: (s.latency.counts[:], s.latency.sum, s.latency.count,
+                             s.sql_statements, s.sql_seconds, s.template_seconds)
+                        for ep, s in self.stats.items()}
+        lines = [
+            '# HELP http_request_duration_seconds Request latency by endpoint.',
+            '# TYPE http_request_duration_seconds histogram',
+        ]
+        for ep, (counts, total, n, *_rest) in sorted(snapshot.items()):
+            label, cumulative = _label(ep), 0
+            for bound, c in zip(BUCKETS + ('+Inf',), counts):
+                cumulative += c
+                lines.append(f'http_request_duration_seconds_bucket{{endpoint="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_sum{{endpoint="{label}"}} {total:.6f}')
+            lines.append(f'http_request_duration_seconds_count{{endpoint="{label}"}} {n}')
+        for name, idx, kind, help_text in (
+            ('sql_statements_total',   3, 'counter', 'SQL statements executed by endpoint.'),
+            ('sql_seconds_total',      4, 'counter', 'Time spent in SQL by endpoint.'),
+            ('template_seconds_total', 5, 'counter', 'Time spent rendering templates by endpoint.'),
+        ):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for ep, values in sorted(snapshot.items()):
+                value = values[idx]
+                value = f'{value:.6f}' if isinstance(value, float) else value
+                lines.append(f'{name}{{endpoint="{_label(ep)}"}} {value}')
+        for collect in self.collectors:
+            lines.extend(collect())
+        return '\n'.join(lines) + '\n'
+
+    def metrics_view(self):
+        return Response(self.render(), mimetype='text/plain; version=0.0.4')
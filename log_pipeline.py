@@ -0,0 +1,270 @@
+# log_pipeline.py
+"""
+Non-blocking, batched structured logging.
+
+The request thread only enqueues: `BoundedQueueHandler` stamps each
+record with the request id and route, renders the message, and drops it
+(counting the drop) when the queue is full. A per-process listener
+thread drains the queue in batches. Each batch goes to the log file as
+JSON lines with size-based rotation (safe with several workers sharing
+the file), and to stdout in the plain
+"[time] LEVEL in module: message" format. The file is flushed once per
+batch.
+
+Messages of the form `Sprint(id=3)` are parsed into an `entities` map,
+so existing log calls gain structured entity ids without changes.
+"""
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import fcntl
+except ImportError:     # Windows: single-process development only
+    fcntl = None
+
+from flask import g, request, has_request_context
+
+ENTITY_RE = re.compile(r'\b([A-Z]\w*)\(id=(\d+)\)')
+STDOUT_FORMAT = logging.Formatter("[%(asctime)s] %(levelname)s in %(module)s: %(message)s")
+
+# Attributes every LogRecord has; anything else came in through `extra=`.
+_STANDARD = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+def to_json(record):
+    doc = {
+        'ts':      datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+        'level':   record.levelname,
+        'logger':  record.name,
+        'module':  record.module,
+        'message': record.getMessage(),
+    }
+    entities = {name: int(ident) for name, ident in ENTITY_RE.findall(doc['message'])}
+    if entities:
+        doc['entities'] = entities
+    for key, value in vars(record).items():
+        if key not in _STANDARD and not key.startswith('_'):
+            doc[key] = value
+    if record.exc_text:
+        doc['exception'] = record.exc_text
+    return json.dumps(doc, default=str)
+
+
+class RotatingWriter:
+    """
+    Append-only file that rolls over to .1 … .N once it exceeds max_bytes.
+
+    Every gunicorn worker has its own writer on the same path, so sizes
+    are read from the file rather than counted locally, a writer reopens
+    the path when another process has rotated it away, and rotation runs
+    under an exclusive lock on `<path>.lock` (where fcntl exists).
+    """
+
+    def __init__(self, path, max_bytes, backups):
+        self.path, self.max_bytes, self.backups = path, max_bytes, backups
+        self.stream = None
+
+    def _open(self):
+        self.stream = open(self.path, 'a', encoding='utf-8')
+
+    def _reopen(self):
+        self.stream.close()
+        self._open()
+
+    def _sync(self):
+        """Size of the file at `path`, reopening it if ours was rotated away."""
+        self.stream.flush()
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            st = None
+        if st is None or st.st_ino != os.fstat(self.stream.fileno()).st_ino:
+            self._reopen()
+            return self.stream.tell()
+        return st.st_size
+
+    @contextmanager
+    def _locked(self):
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.path}.lock", 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _rotate(self, needed):
+        with self._locked():
+            # Another worker may have rotated while we waited for the lock.
+            size = self._sync()
+            if not size or size + needed <= self.max_bytes:
+                return
+            for i in range(self.backups - 1, 0, -1):
+                src = f"{self.path}.{i}"
+                if os.path.exists(src):
+                    os.replace(src, f"{self.path}.{i + 1}")
+            if self.backups:
+                os.replace(self.path, f"{self.path}.1")
+            else:
+                os.remove(self.path)
+            self._reopen()
+
+    def write(self, text):
+        if self.stream is None:
+            self._open()
+        size = self._sync()
+        if self.max_bytes and size and size + len(text) > self.max_bytes:
+            self._rotate(len(text))
+        self.stream.write(text)
+
+    def flush(self):
+        if self.stream:
+            self.stream.flush()
+
+    def close(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+
+class LogPipeline:
+    """Owns the queue and the listener thread for the current process."""
+
+    _STOP = object()
+
+    def __init__(self, path='capacity_planner.log', max_bytes=10 * 1024 * 1024,
+                 backups=5, queue_size=10_000, batch_size=256, stdout=True):
+        self.path, self.max_bytes, self.backups = path, max_bytes, backups
+        self.batch_size = batch_size
+        self.stdout     = stdout
+        self.queue      = queue.Queue(maxsize=queue_size)
+        self.dropped    = 0
+        self.written    = 0
+        self._pid       = None
+        self._thread    = None
+        self._lock      = threading.Lock()
+        self._drop_lock = threading.Lock()
+
+    def _count_dropped(self, n=1):
+        with self._drop_lock:
+            self.dropped += n
+
+    def ensure_started(self):
+        # Threads do not survive fork(); each worker starts its own listener.
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                self.queue = queue.Queue(maxsize=self.queue.maxsize)
+            self._pid    = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='log-pipeline', daemon=True)
+            self._thread.start()
+
+    def put(self, record):
+        self.ensure_started()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self._count_dropped()
+
+    def _run(self):
+        writer  = RotatingWriter(self.path, self.max_bytes, self.backups)
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if self._STOP in batch:
+                running = False
+                batch = [r for r in batch if r is not self._STOP]
+            if not batch:
+                continue
+            try:
+                writer.write(''.join(to_json(r) + '\n' for r in batch))
+                writer.flush()
+                if self.stdout:
+                    sys.stdout.write(''.join(STDOUT_FORMAT.format(r) + '\n' for r in batch))
+                    sys.stdout.flush()
+                self.written += len(batch)
+            except Exception:
+                self._count_dropped(len(batch))
+        writer.close()
+
+    def stop(self, timeout=5.0):
+        """Flush everything queued so far and stop the listener (idempotent)."""
+        if self._pid != os.getpid() or not self._thread or not self._thread.is_alive():
+            return
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                self.queue.put(self._STOP, timeout=0.1)
+                break
+            except queue.Full:
+                if time.monotonic() > deadline:
+                    return
+        self._thread.join(timeout)
+        self._pid = None
+
+    def stats(self):
+        return {'queued': self.queue.qsize(), 'written': self.written, 'dropped': self.dropped}
+
+
+class BoundedQueueHandler(logging.Handler):
+    """Hands records to a LogPipeline without doing any I/O on the caller's thread."""
+
+    def __init__(self, pipeline):
+        super().__init__()
+        self.pipeline = pipeline
+
+    def prepare(self, record):
+        # Work on a copy: other handlers (caplog, Sentry, ...) still need the
+        # original args and exc_info.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        if has_request_context():
+            record.request_id = g.get('request_id')
+            record.method     = request.method
+            record.route      = request.url_rule.rule if request.url_rule else request.path
+        return record
+
+    def emit(self, record):
+        try:
+            self.pipeline.put(self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+
+pipeline = LogPipeline(
+    path       = os.environ.get('LOG_FILE', 'capacity_planner.log'),
+    max_bytes  = int(os.environ.get('LOG_MAX_BYTES', 10 * 1024 * 1024)),
+    backups    = int(os.environ.get('LOG_BACKUPS', 5)),
+    queue_size = int(os.environ.get('LOG_QUEUE_SIZE', 10_000)),
+    batch_size = int(os.environ.get('LOG_BATCH_SIZE', 256)),
+)
+atexit.register(pipeline.stop)
+
+
+def queue_handler():
+    """dictConfig factory for the root handler."""
+    return BoundedQueueHandler(pipeline)
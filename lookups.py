@@ -0,0 +1,107 @@
+# lookups.py
+"""
+Process-wide cache of resource types, groups and the resource directory.
+
+Each worker keeps one immutable snapshot tagged with the `lookups`
+Revision value. Write routes call `lookup_cache.invalidate()` for the
+local worker; other workers notice the bumped revision on their next
+request (one primary-key lookup, memoised per request) and reload.
+
+Types and groups are always cached. The resource directory is cached only
+while it has at most `max_resources` rows. Above that, the snapshot holds
+no directory and `resources_by_id()` reads just the requested rows. It
+also reads any id the cached directory lacks, such as a resource
+committed after the snapshot's revision was read.
+"""
+import threading
+from collections import namedtuple
+
+from flask import request, has_request_context
+
+from sqlalchemy import func
+
+from models import db, ResourceType, ResourceGroup, Resource, get_revision, LOOKUPS_KEY
+
+Entry         = namedtuple('Entry', 'id name')
+ResourceEntry = namedtuple('ResourceEntry', 'id name type_id group_id type_name group_name')
+Lookups       = namedtuple('Lookups', 'version types groups type_names group_names resources resource_by_id')
+
+
+class LookupCache:
+    def __init__(self, max_resources=50_000):
+        self.max_resources = max_resources
+        self.hits     = 0
+        self.misses   = 0
+        self._data    = None
+        self._lock    = threading.Lock()
+
+    def _version(self):
+        # One revision read per request, however many times the cache is consulted.
+        if not has_request_context():
+            return get_revision(LOOKUPS_KEY)
+        version = getattr(request, '_lookups_version', None)
+        if version is None:
+            version = request._lookups_version = get_revision(LOOKUPS_KEY)
+        return version
+
+    def _load(self, version):
+        types  = [Entry(i, n) for i, n in db.session.query(ResourceType.id, ResourceType.name).order_by(ResourceType.name)]
+        groups = [Entry(i, n) for i, n in db.session.query(ResourceGroup.id, ResourceGroup.name).order_by(ResourceGroup.name)]
+        type_names  = {t.id: t.name for t in types}
+        group_names = {gr.id: gr.name for gr in groups}
+        if db.session.query(func.count(Resource.id)).scalar() > self.max_resources:
+            return Lookups(version, types, groups, type_names, group_names, None, None)
+        resources = self._entries(type_names, group_names, db.session.query(
+            Resource.id, Resource.name, Resource.type_id, Resource.group_id
+        ).order_by(Resource.name))
+        return Lookups(version, types, groups, type_names, group_names,
+                       resources, {r.id: r for r in resources})
+
+    @staticmethod
+    def _entries(type_names, group_names, rows):
+        return [ResourceEntry(i, n, tid, gid, type_names.get(tid), group_names.get(gid))
+                for i, n, tid, gid in rows]
+
+    def snapshot(self):
+        version = self._version()
+        data = self._data
+        if data is not None and data.version == version:
+            with self._lock:
+                self.hits += 1
+            return data
+        with self._lock:
+            self.misses += 1
+            data = self._data = self._load(version)
+        return data
+
+    def resources_by_id(self, ids):
+        """Map each existing id in `ids` to its ResourceEntry."""
+        data  = self.snapshot()
+        known = data.resource_by_id or {}
+        found = {rid: known[rid] for rid in ids if rid in known}
+        missing = set(ids) - set(found)
+        if missing:
+            rows = (db.session.query(Resource.id, Resource.name, Resource.type_id, Resource.group_id)
+                    .filter(Resource.id.in_(missing)))
+            found.update((r.id, r) for r in self._entries(data.type_names, data.group_names, rows))
+        return found
+
+    def invalidate(self):
+        self._data = None
+        if has_request_context():
+            request._lookups_version = None
+
+    def stats(self):
+        data = self._data
+        return {
+            'hits':      self.hits,
+            'misses':    self.misses,
+            'version':   data.version if data else None,
+            'resources': len(data.resources) if data and data.resources is not None else 0,
+            'directory_cached': bool(data and data.resources is not None),
+            'types':     len(data.types) if data else 0,
+            'groups':    len(data.groups) if data else 0,
+        }
+
+
+lookup_cache = LookupCache()
@@ -0,0 +1,120 @@
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+db = SQLAlchemy()
+
+# ─── Models ────────────────────────────────────────────────────────────
+class Sprint(db.Model):
+    id          = db.Column(db.Integer, primary_key=True)
+    name        = db.Column(db.String(80), nullable=False)
+    projects    = db.relationship('Project',    backref='sprint',    cascade='all, delete-orphan')
+    assignments = db.relationship('Assignment', backref='sprint',    cascade='all, delete-orphan')
+
+class Project(db.Model):
+    id          = db.Column(db.Integer, primary_key=True)
+    name        = db.Column(db.String(80), nullable=False)
+    sprint_id   = db.Column(db.Integer, db.ForeignKey('sprint.id'), nullable=False)
+    assignments = db.relationship('Assignment', backref='project',   cascade='all, delete-orphan')
+
+class ResourceType(db.Model):
+    id        = db.Column(db.Integer, primary_key=True)
+    name      = db.Column(db.String(80), unique=True, nullable=False)
+    resources = db.relationship('Resource', backref='type', cascade='all, delete-orphan')
+
+class ResourceGroup(db.Model):
+    id        = db.Column(db.Integer, primary_key=True)
+    name      = db.Column(db.String(80), unique=True, nullable=False)
+    resources = db.relationship('Resource', backref='group', cascade='all, delete-orphan')
+
+class Resource(db.Model):
+    __table_args__ = (
+        # Keyset pages sort names in binary order (queries.name_key); SQLite's
+        # default collation already is, Postgres needs a "C" index for it.
+        db.Index('ix_resource_name_binary', db.text('name COLLATE "C"'), 'id').ddl_if(dialect='postgresql'),
+    )
+    id          = db.Column(db.Integer, primary_key=True)
+    name        = db.Column(db.String(80), unique=True, nullable=False)
+    type_id     = db.Column(db.Integer, db.ForeignKey('resource_type.id'), nullable=True, index=True)
+    group_id    = db.Column(db.Integer, db.ForeignKey('resource_group.id'), nullable=True, index=True)
+    assignments = db.relationship('Assignment', backref='resource', cascade='all, delete-orphan')
+
+class Assignment(db.Model):
+    __table_args__ = (
+        db.Index('ix_assignment_sprint_resource', 'sprint_id', 'resource_id'),
+        db.Index('ix_assignment_project', 'project_id'),
+    )
+    id          = db.Column(db.Integer, primary_key=True)
+    sprint_id   = db.Column(db.Integer, db.ForeignKey('sprint.id'),    nullable=False)
+    project_id  = db.Column(db.Integer, db.ForeignKey('project.id'),   nullable=False)
+    resource_id = db.Column(db.Integer, db.ForeignKey('resource.id'),  nullable=False)
+    capacity    = db.Column(db.Integer, default=100)
+
+class SprintEvent(db.Model):
+    """Change feed behind the live sprint boards; sprint_id NULL means every sprint."""
+    id        = db.Column(db.Integer, primary_key=True)
+    sprint_id = db.Column(db.Integer, nullable=True, index=True)
+    kind      = db.Column(db.String(40), nullable=False)
+    payload   = db.Column(db.Text, nullable=False)
+
+
+class Revision(db.Model):
+    """Monotonic change counters, e.g. 'sprint:3'; bumped by every write route."""
+    key   = db.Column(db.String(80), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+
+SPRINTS_KEY = 'sprints'   # sprint list membership and names
+LOOKUPS_KEY = 'lookups'   # resources, types and groups
+
+
+def sprint_key(sprint_id):
+    return f"sprint:{sprint_id}"
+
+
+def get_revision(key):
+    value = db.session.query(Revision.value).filter_by(key=key).scalar()
+    return value or 0
+
+
+def get_revisions(keys):
+    """Map each of `keys` to its current value in one query (missing keys → 0)."""
+    found = dict(db.session.query(Revision.key, Revision.value).filter(Revision.key.in_(keys)))
+    return {k: found.get(k, 0) for k in keys}
+
+
+# Dialects with INSERT … ON CONFLICT DO UPDATE … RETURNING.
+_UPSERTS = {'postgresql': pg_insert, 'sqlite': sqlite_insert}
+
+
+def bump_revision(key):
+    """Increment `key` inside the current transaction and return the new value."""
+    upsert = _UPSERTS.get(db.session.get_bind().dialect.name)
+    if upsert is not None:
+        # One statement, so two first writers of a new key cannot both INSERT.
+        stmt = (upsert(Revision)
+                .values(key=key, value=1)
+                .on_conflict_do_update(index_elements=[Revision.key],
+                                       set_={'value': Revision.value + 1})
+                .returning(Revision.value))
+        return db.session.execute(stmt).scalar_one()
+    updated = (db.session.query(Revision)
+               .filter_by(key=key)
+               .update({Revision.value: Revision.value + 1}, synchronize_session=False))
+    if not updated:
+        db.session.add(Revision(key=key, value=1))
+        db.session.flush()
+    return get_revision(key)
+
+
+def ensure_indexes():
+    """create_all() skips indexes on tables that already exist; add any missing ones."""
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+
+
+def init_schema():
+    """One-off schema setup run by `flask init-db`, never at import or worker boot."""
+    db.create_all()
+    ensure_indexes()
@@ -0,0 +1,167 @@
+# queries.py
+"""
+Set-based read queries for the sprint board.
+
+Each helper issues a fixed number of statements regardless of how many
+projects, resources or assignments a sprint holds, so templates can walk
+the returned objects without triggering lazy loads. Resource, type and
+group names come from the process-wide `lookup_cache`. The pool and the
+resources list are also served as keyset pages on (name, id) with their
+filters applied in SQL. Names sort in binary (code point) order on every
+database, and the name-prefix filter is case-insensitive; the client
+applies the same two rules when it places live updates in a loaded page.
+"""
+from sqlalchemy import func, or_, and_
+from sqlalchemy.orm import selectinload
+
+from models import db, Sprint, Project, Resource, Assignment
+from lookups import lookup_cache
+
+FULL_CAPACITY = 100
+PAGE_SIZE     = 100
+MAX_PAGE_SIZE = 500
+
+
+def used_capacity_subquery(sprint_id):
+    """(resource_id, used) for every resource with assignments in the sprint."""
+    return (
+        db.session.query(
+            Assignment.resource_id.label('resource_id'),
+            func.sum(Assignment.capacity).label('used'),
+        )
+        .filter(Assignment.sprint_id == sprint_id)
+        .group_by(Assignment.resource_id)
+        .subquery()
+    )
+
+
+def used_capacity(sprint_id):
+    """Map resource_id → total assigned capacity in the sprint (one grouped query)."""
+    used = used_capacity_subquery(sprint_id)
+    return {rid: int(total or 0) for rid, total in db.session.query(used.c.resource_id, used.c.used)}
+
+
+def sprint_board(sprint_id):
+    """Sprint with projects → assignments eagerly loaded (resources come from the cache)."""
+    return (
+        Sprint.query
+        .options(selectinload(Sprint.projects).selectinload(Project.assignments))
+        .filter_by(id=sprint_id)
+        .first_or_404()
+    )
+
+
+def filter_options():
+    """(types, groups) ordered by name for the filter panel."""
+    lookups = lookup_cache.snapshot()
+    return lookups.types, lookups.groups
+
+
+def resource_state(sprint_id, resource_id):
+    """JSON-ready resource metadata plus its remaining capacity in the sprint."""
+    r = lookup_cache.resources_by_id([resource_id]).get(resource_id)
+    if r is None:
+        return None
+    used = (db.session.query(func.coalesce(func.sum(Assignment.capacity), 0))
+            .filter(Assignment.sprint_id == sprint_id, Assignment.resource_id == resource_id)
+            .scalar())
+    return {
+        'id':         r.id,
+        'name':       r.name,
+        'type_id':    r.type_id,
+        'type_name':  r.type_name,
+        'group_id':   r.group_id,
+        'group_name': r.group_name,
+        'remaining':  FULL_CAPACITY - int(used),
+    }
+
+
+def resource_states(sprint_id, resource_ids):
+    """resource_state() for several resources with one grouped query."""
+    resource_by_id = lookup_cache.resources_by_id(resource_ids)
+    used = used_capacity(sprint_id)
+    return [
+        {
+            'id':         r.id,
+            'name':       r.name,
+            'type_id':    r.type_id,
+            'type_name':  r.type_name,
+            'group_id':   r.group_id,
+            'group_name': r.group_name,
+            'remaining':  FULL_CAPACITY - used.get(r.id, 0),
+        }
+        for r in (resource_by_id.get(rid) for rid in resource_ids) if r is not None
+    ]
+
+
+# ─── Keyset pagination ─────────────────────────────────────────────────
+def _escape_like(prefix):
+    return prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def name_key():
+    """Resource.name in binary order: SQLite's default, an explicit "C" collation on Postgres."""
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return Resource.name.collate('C')
+    return Resource.name
+
+
+def _filtered(query, type_ids=None, group_ids=None, prefix=None):
+    if type_ids:
+        query = query.filter(Resource.type_id.in_(type_ids))
+    if group_ids:
+        query = query.filter(Resource.group_id.in_(group_ids))
+    if prefix:
+        query = query.filter(Resource.name.ilike(_escape_like(prefix) + '%', escape='\\'))
+    return query
+
+
+def _page(query, after, limit):
+    """Apply the (name, id) keyset and return (rows, next_cursor)."""
+    limit = max(1, min(limit or PAGE_SIZE, MAX_PAGE_SIZE))
+    key   = name_key()
+    if after:
+        name, rid = after
+        query = query.filter(or_(key > name, and_(Resource.name == name, Resource.id > rid)))
+    rows = query.order_by(key, Resource.id).limit(limit + 1).all()
+    cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        cursor = {'after_name': rows[-1][1], 'after_id': rows[-1][0]}
+    return rows, cursor
+
+
+def _entry(lookups, rid, name, type_id, group_id, **extra):
+    return {
+        'id': rid, 'name': name,
+        'type_id': type_id,   'type_name': lookups.type_names.get(type_id),
+        'group_id': group_id, 'group_name': lookups.group_names.get(group_id),
+        **extra,
+    }
+
+
+def resources_page(type_ids=None, group_ids=None, prefix=None, after=None, limit=None):
+    """One keyset page of resources ordered by (name, id), filtered in SQL."""
+    query = _filtered(
+        db.session.query(Resource.id, Resource.name, Resource.type_id, Resource.group_id),
+        type_ids, group_ids, prefix
+    )
+    rows, cursor = _page(query, after, limit)
+    lookups = lookup_cache.snapshot()
+    return [_entry(lookups, *row) for row in rows], cursor
+
+
+def pool_page(sprint_id, type_ids=None, group_ids=None, prefix=None, after=None, limit=None):
+    """One keyset page of resources with capacity left in the sprint."""
+    used      = used_capacity_subquery(sprint_id)
+    remaining = (FULL_CAPACITY - func.coalesce(used.c.used, 0)).label('remaining')
+    query = _filtered(
+        db.session.query(Resource.id, Resource.name, Resource.type_id, Resource.group_id, remaining)
+        .outerjoin(used, used.c.resource_id == Resource.id)
+        .filter(remaining > 0),
+        type_ids, group_ids, prefix
+    )
+    rows, cursor = _page(query, after, limit)
+    lookups = lookup_cache.snapshot()
+    return [_entry(lookups, rid, name, tid, gid, remaining=int(rem))
+            for rid, name, tid, gid, rem in rows], cursor
@@ -0,0 +1,70 @@
+# sprint_copy.py
+"""
+Set-based sprint copy.
+
+`copy_sprint` creates the new Sprint row, copies the projects with one
+batched INSERT … RETURNING, and copies the assignments with a single
+INSERT … SELECT, so the cost does not grow with round trips. RETURNING
+with sort_by_parameter_order pairs every new project id with the source
+row it was built from, on any backend (Postgres batches the rows; SQLite
+sends one per project). The pairs go into a transaction-local temporary
+table, and the assignment copy joins it, so the statement stays the same
+size however many projects the sprint has.
+"""
+from sqlalchemy import select, insert, literal, case, Table, Column, Integer, MetaData
+
+from models import db, Sprint, Project, Assignment
+
+# old project id → new project id for the copy in progress.
+_project_map = Table(
+    'sprint_copy_project_map', MetaData(),
+    Column('old_id', Integer, primary_key=True),
+    Column('new_id', Integer, nullable=False),
+    prefixes=['TEMPORARY'],
+)
+
+
+def copy_sprint(src, name, projects_only=False, scale=100):
+    """
+    Copy `src` (a Sprint) into a new sprint called `name` and return it.
+
+    `scale` is a percentage applied to every copied capacity (rounded
+    down, never below 1). Runs inside the caller's transaction.
+    """
+    new = Sprint(name=name)
+    db.session.add(new)
+    db.session.flush()
+
+    old = db.session.execute(
+        select(Project.id, Project.name).where(Project.sprint_id == src.id).order_by(Project.id)
+    ).all()
+    if not old:
+        return new
+    new_ids = db.session.scalars(
+        insert(Project).returning(Project.id, sort_by_parameter_order=True),
+        [{'name': project_name, 'sprint_id': new.id} for _, project_name in old]
+    ).all()
+    if projects_only:
+        return new
+
+    # Created and dropped inside the caller's transaction; a rollback undoes both.
+    conn = db.session.connection()
+    _project_map.create(conn)
+    conn.execute(insert(_project_map), [
+        {'old_id': old_id, 'new_id': new_id} for (old_id, _), new_id in zip(old, new_ids)
+    ])
+    capacity = Assignment.capacity
+    if scale != 100:
+        scaled   = (Assignment.capacity * scale) // 100
+        capacity = case((scaled < 1, 1), else_=scaled)
+
+    db.session.execute(
+        insert(Assignment).from_select(
+            ['sprint_id', 'project_id', 'resource_id', 'capacity'],
+            select(literal(new.id), _project_map.c.new_id, Assignment.resource_id, capacity)
+            .join(_project_map, Assignment.project_id == _project_map.c.old_id)
+            .where(Assignment.sprint_id == src.id)
+        )
+    )
+    _project_map.drop(conn)
+    return new
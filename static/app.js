@@ -1,49 +1,283 @@
 // static/app.js
 
 document.addEventListener('DOMContentLoaded', () => {
+  // ─── Keyset-paginated lists ───────────────────────────────────────────
+  // The server renders the first page and leaves its cursor in
+  // data-after-name / data-after-id; further pages are fetched from
+  // data-source when a sentinel below the list scrolls into view.
+
+  // Names sort in code-point order, the server's binary collation (a plain
+  // `<` compares UTF-16 units, which differs for characters past U+FFFF).
+  function compareNames(a, b) {
+    const x = Array.from(a), y = Array.from(b);
+    for (let i = 0; i < Math.min(x.length, y.length); i++) {
+      if (x[i] !== y[i]) return x[i].codePointAt(0) - y[i].codePointAt(0);
+    }
+    return x.length - y.length;
+  }
+
+  function keysetPager(list, renderPage) {
+    const sentinel = document.createElement('div');
+    sentinel.className = 'page-sentinel';
+    list.after(sentinel);
+
+    let cursor = list.dataset.afterId
+      ? { after_name: list.dataset.afterName, after_id: list.dataset.afterId }
+      : null;
+    let filters = {}, busy = false, generation = 0;
+
+    async function load(reset) {
+      if (!reset && (busy || !cursor)) return;
+      const gen = reset ? ++generation : generation;
+      const params = new URLSearchParams(filters);
+      if (!reset) Object.entries(cursor).forEach(([k, v]) => params.set(k, v));
+      busy = true;
+      try {
+        const resp = await fetch(`${list.dataset.source}?${params}`);
+        const data = await resp.json();
+        if (gen !== generation) return;          // superseded by a newer filter
+        cursor = data.next;
+        renderPage(data.resources, reset);
+      } finally {
+        if (gen === generation) busy = false;
+      }
+      // Re-observing re-fires the callback if the sentinel is still visible.
+      observer.unobserve(sentinel);
+      observer.observe(sentinel);
+    }
+
+    const observer = new IntersectionObserver(entries => {
+      if (entries.some(e => e.isIntersecting)) load(false);
+    });
+    observer.observe(sentinel);
+
+    return {
+      filter(next) { filters = next; return load(true); },
+      // Everything up to and including `name` has been loaded.
+      covers(name) {
+        if (!cursor) return true;
+        return compareNames(name, cursor.after_name) <= 0;
+      }
+    };
+  }
+
   // ─── 1) Sprint‐detail filters that “stick” ─────────────────────────────
   const sprintDetail = document.querySelector('.sprint-detail-section');
   if (sprintDetail) {
-    const sprintId   = sprintDetail.querySelector('[data-sprint-id]')?.dataset?.sprintId;
+    const sprintId   = sprintDetail.dataset.sprintId;
+    const nameInput  = document.querySelector('.filter-name');
     const typeBoxes  = Array.from(document.querySelectorAll('.filter-type'));
     const groupBoxes = Array.from(document.querySelectorAll('.filter-group'));
 
     function loadFilters() {
       if (!sprintId) return;
       const stored = JSON.parse(localStorage.getItem(`filters:${sprintId}`) || '{}');
+      nameInput.value = stored.q || '';
       typeBoxes.forEach(cb => { cb.checked = stored.types?.includes(cb.value) || false; });
       groupBoxes.forEach(cb => { cb.checked = stored.groups?.includes(cb.value) || false; });
     }
 
+    function currentFilters() {
+      return {
+        q:      nameInput.value.trim(),
+        types:  typeBoxes.filter(cb => cb.checked).map(cb => cb.value),
+        groups: groupBoxes.filter(cb => cb.checked).map(cb => cb.value)
+      };
+    }
+
+    function matchesFilters(res) {
+      const f = currentFilters();
+      return (!f.types.length  || f.types.includes(String(res.type_id ?? '')))
+          && (!f.groups.length || f.groups.includes(String(res.group_id ?? '')))
+          && (!f.q || res.name.toLowerCase().startsWith(f.q.toLowerCase()));
+    }
+
+    // Filtering happens in SQL: every change reloads the pool from its first page.
     function saveAndApplyFilters() {
       if (!sprintId) return;
-      const selT = typeBoxes.filter(cb => cb.checked).map(cb => cb.value);
-      const selG = groupBoxes.filter(cb => cb.checked).map(cb => cb.value);
-      localStorage.setItem(`filters:${sprintId}`, JSON.stringify({ types: selT, groups: selG }));
-
-      document.querySelectorAll('#resource-pool .draggable-resource').forEach(li => {
-        const tOK = !selT.length || (li.dataset.typeId && selT.includes(li.dataset.typeId));
-        const gOK = !selG.length || (li.dataset.groupId && selG.includes(li.dataset.groupId));
-        li.style.display = (tOK && gOK) ? '' : 'none';
-      });
+      const f = currentFilters();
+      localStorage.setItem(`filters:${sprintId}`, JSON.stringify(f));
+      const params = {};
+      if (f.q)             params.q         = f.q;
+      if (f.types.length)  params.type_ids  = f.types.join(',');
+      if (f.groups.length) params.group_ids = f.groups.join(',');
+      return poolPager.filter(params);
     }
 
-    loadFilters();
-    typeBoxes.forEach(cb => cb.addEventListener('change', saveAndApplyFilters));
-    groupBoxes.forEach(cb => cb.addEventListener('change', saveAndApplyFilters));
-    saveAndApplyFilters();
-
     // Clear filters on navigate away
     window.addEventListener('beforeunload', () => {
       if (sprintId) localStorage.removeItem(`filters:${sprintId}`);
     });
 
+    // ─── Board patching helpers ──────────────────────────────────
+    const pool = document.getElementById('resource-pool');
+
+    function el(tag, className, text) {
+      const node = document.createElement(tag);
+      if (className) node.className = className;
+      if (text !== undefined) node.textContent = text;
+      return node;
+    }
+
+    function metaFor(res) {
+      if (!res.type_name && !res.group_name) return null;
+      const meta = el('div', 'resource-meta');
+      if (res.type_name)  meta.appendChild(el('span', 'meta-type', res.type_name));
+      if (res.group_name) meta.appendChild(el('span', 'meta-group', res.group_name));
+      return meta;
+    }
+
+    function poolSlot(res, capacity) {
+      const li = el('li', 'draggable-resource');
+      li.draggable = true;
+      li.dataset.id       = res.id;
+      li.dataset.name     = res.name;
+      li.dataset.capacity = capacity;
+      li.dataset.typeId   = res.type_id ?? '';
+      li.dataset.groupId  = res.group_id ?? '';
+      li.appendChild(el('strong', null, res.name));
+      const meta = metaFor(res);
+      if (meta) li.appendChild(meta);
+      li.appendChild(el('div', 'capacity-label', `${capacity}%`));
+      setupResource(li);
+      return li;
+    }
+
+    function poolSlots(resId) {
+      return Array.from(pool.querySelectorAll(`.draggable-resource[data-id="${resId}"]`));
+    }
+
+    function syncPoolPlaceholder() {
+      const empty = pool.querySelector('.no-available');
+      const hasSlots = !!pool.querySelector('.draggable-resource');
+      if (hasSlots && empty) empty.remove();
+      if (!hasSlots && !empty) {
+        const li = el('li', 'no-available');
+        li.appendChild(el('em', null, 'None left to assign.'));
+        pool.appendChild(li);
+      }
+    }
+
+    // Replace every slot for a resource with a single slot holding its remaining
+    // capacity. Entries past the last loaded page arrive with a later page instead.
+    function resetPoolEntry(res) {
+      const slots = poolSlots(res.id);
+      slots.forEach(s => s.remove());
+      if (res.remaining > 0 && matchesFilters(res) && poolPager.covers(res.name)) {
+        const slot   = poolSlot(res, res.remaining);
+        const before = Array.from(pool.querySelectorAll('.draggable-resource'))
+          .find(li => compareNames(li.dataset.name, res.name) > 0);
+        pool.insertBefore(slot, before || null);
+      }
+      syncPoolPlaceholder();
+    }
+
+    function renderPoolPage(resources, reset) {
+      if (reset) pool.querySelectorAll('.draggable-resource').forEach(li => li.remove());
+      resources.forEach(res => pool.appendChild(poolSlot(res, res.remaining)));
+      syncPoolPlaceholder();
+    }
+
+    function assignmentItem(assignment, res) {
+      const li = el('li');
+      li.dataset.assignmentId = assignment.id;
+      li.dataset.typeId       = res.type_id ?? '';
+      li.dataset.groupId      = res.group_id ?? '';
+      li.appendChild(el('strong', null, res.name));
+      const meta = metaFor(res);
+      if (meta) li.appendChild(meta);
+      li.appendChild(document.createTextNode(` (${assignment.capacity}%) `));
+      const btn = el('button', 'btn btn-secondary unassign-btn');
+      btn.dataset.resourceId = res.id;
+      btn.appendChild(el('span', 'material-icons', 'close'));
+      li.appendChild(btn);
+      return li;
+    }
+
+    function syncAssignmentPlaceholder(list) {
+      const empty = list.querySelector('.no-assigned');
+      const hasItems = !!list.querySelector('li[data-assignment-id]');
+      if (hasItems && empty) empty.remove();
+      if (!hasItems && !empty) {
+        const li = el('li', 'no-assigned');
+        li.appendChild(el('em', null, 'No resources assigned.'));
+        list.appendChild(li);
+      }
+    }
+
+    function setRevision(revision) {
+      if (revision > Number(sprintDetail.dataset.revision)) sprintDetail.dataset.revision = revision;
+    }
+
+    function projectZone(projectId) {
+      return sprintDetail.querySelector(`.project-dropzone[data-project-id="${projectId}"]`);
+    }
+
+    function assignmentEntry(assignmentId) {
+      return sprintDetail.querySelector(`li[data-assignment-id="${assignmentId}"]`);
+    }
+
+    // Both apply* helpers are idempotent: the acting tab sees each change
+    // twice, once in its POST response and once on the event stream.
+    function applyAssigned(data) {
+      setRevision(data.revision);
+      const zone = projectZone(data.assignment.project_id);
+      if (!zone || assignmentEntry(data.assignment.id)) return false;
+      const list = zone.querySelector('.assignment-list');
+      list.appendChild(assignmentItem(data.assignment, data.resource));
+      syncAssignmentPlaceholder(list);
+      return true;
+    }
+
+    function applyUnassigned(data) {
+      setRevision(data.revision);
+      const item = assignmentEntry(data.assignment.id);
+      if (!item) return false;
+      const list = item.closest('.assignment-list');
+      item.remove();
+      syncAssignmentPlaceholder(list);
+      return true;
+    }
+
+    async function postJSON(url, body) {
+      const resp = await fetch(url, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body)
+      });
+      const data = await resp.json().catch(() => ({}));
+      if (!resp.ok || !data.success) throw new Error(data.error || `Request failed (${resp.status})`);
+      return data;
+    }
+
     // ─── Drag & Drop ─────────────────────────────────────────────
+    let draggedSlot = null;
+
     function setupResource(el) {
       el.addEventListener('dragstart', ev => {
+        draggedSlot = el;
         ev.dataTransfer.setData('text/plain', el.dataset.id);
         ev.dataTransfer.setData('application/capacity', el.dataset.capacity);
       });
+      // Right-click splits a slot into two so the halves can go to different projects.
+      el.addEventListener('contextmenu', ev => {
+        ev.preventDefault();
+        const total = parseInt(el.dataset.capacity, 10);
+        if (total < 2) return;
+        const input = prompt(`Split ${total}% — capacity for the first slot:`, Math.floor(total / 2));
+        const first = parseInt(input, 10);
+        if (!(first > 0 && first < total)) return;
+        const res = {
+          id: el.dataset.id, name: el.dataset.name,
+          type_id: el.dataset.typeId, group_id: el.dataset.groupId,
+          type_name: el.querySelector('.meta-type')?.textContent,
+          group_name: el.querySelector('.meta-group')?.textContent
+        };
+        const a = poolSlot(res, first);
+        const b = poolSlot(res, total - first);
+        el.replaceWith(a);
+        a.after(b);
+      });
     }
 
     document.querySelectorAll('#resource-pool .draggable-resource').forEach(el => {
@@ -51,46 +285,213 @@ document.addEventListener('DOMContentLoaded', () => {
       setupResource(el);
     });
 
-    document.querySelectorAll('.project-dropzone').forEach(zone => {
+    const poolPager = keysetPager(pool, renderPoolPage);
+    loadFilters();
+    nameInput.addEventListener('input', saveAndApplyFilters);
+    typeBoxes.forEach(cb => cb.addEventListener('change', saveAndApplyFilters));
+    groupBoxes.forEach(cb => cb.addEventListener('change', saveAndApplyFilters));
+    const f = currentFilters();
+    if (f.q || f.types.length || f.groups.length) saveAndApplyFilters();
+
+    function setupZone(zone) {
       zone.addEventListener('dragover', ev => { ev.preventDefault(); zone.classList.add('dragover'); });
       zone.addEventListener('dragleave', () => { zone.classList.remove('dragover'); });
       zone.addEventListener('drop', async ev => {
         ev.preventDefault();
         zone.classList.remove('dragover');
+        const slot     = draggedSlot;
+        draggedSlot    = null;
         const resId    = ev.dataTransfer.getData('text/plain');
         const capacity = ev.dataTransfer.getData('application/capacity');
         const projId   = zone.dataset.projectId;
         const sprintId = zone.dataset.sprintId;
-        await fetch('/assign', {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify({ sprint_id: sprintId, project_id: projId, resource_id: resId, capacity })
-        });
-        window.location.reload();
+        let data;
+        try {
+          data = await postJSON('/assign', { sprint_id: sprintId, project_id: projId, resource_id: resId, capacity });
+        } catch (err) {
+          alert(err.message);
+          return;
+        }
+        applyAssigned(data);
+
+        // Keep sibling split slots; only rebuild the entry when nothing is left of it.
+        if (slot && slot.isConnected) slot.remove();
+        if (!poolSlots(resId).length) resetPoolEntry(data.resource);
+        else syncPoolPlaceholder();
       });
-    });
 
-    // ─── Unassign ─────────────────────────────────────────────────
-    document.querySelectorAll('.unassign-btn').forEach(btn => {
-      btn.addEventListener('click', async () => {
-        const zone     = btn.closest('.project-dropzone');
-        const sid      = zone.dataset.sprintId;
-        const pid      = zone.dataset.projectId;
-        const rid      = btn.dataset.resourceId;
-        await fetch('/unassign', {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify({ sprint_id: sid, project_id: pid, resource_id: rid })
-        });
-        window.location.reload();
+      // ─── Unassign ───────────────────────────────────────────────
+      zone.addEventListener('click', async ev => {
+        const btn = ev.target.closest('.unassign-btn');
+        if (!btn) return;
+        const item = btn.closest('li');
+        let data;
+        try {
+          data = await postJSON('/unassign', {
+            sprint_id: zone.dataset.sprintId,
+            project_id: zone.dataset.projectId,
+            resource_id: btn.dataset.resourceId,
+            assignment_id: item.dataset.assignmentId
+          });
+        } catch (err) {
+          alert(err.message);
+          return;
+        }
+        applyUnassigned(data);
+        resetPoolEntry(data.resource);
+      });
+    }
+
+    document.querySelectorAll('.project-dropzone').forEach(setupZone);
+
+    function iconButton(icon, title) {
+      const btn = el('button', 'btn btn-secondary');
+      btn.title = title;
+      btn.appendChild(el('span', 'material-icons', icon));
+      return btn;
+    }
+
+    function projectCard(project) {
+      const card = el('div', 'card project-card project-dropzone');
+      card.dataset.projectId = project.id;
+      card.dataset.sprintId  = sprintId;
+      const base   = `/sprints/${sprintId}/projects`;
+      const rename = el('form', 'inline-form');
+      rename.method = 'post';
+      rename.action = `${base}/edit/${project.id}`;
+      const input = el('input', 'input input-small');
+      input.name     = 'name';
+      input.value    = project.name;
+      input.required = true;
+      rename.append(input, iconButton('edit', 'Rename'));
+      const remove = el('form', 'inline-form');
+      remove.method = 'post';
+      remove.action = `${base}/delete/${project.id}`;
+      remove.append(iconButton('delete', 'Delete'));
+      const title = el('h4');
+      title.append(document.createTextNode(project.name), rename, remove);
+      const list = el('ul', 'assignment-list');
+      syncAssignmentPlaceholder(list);
+      card.append(title, list);
+      setupZone(card);
+      return card;
+    }
+
+    // Resource renamed or re-typed: patch its pool slots and assignment rows in place.
+    function patchResource(res) {
+      poolSlots(res.id).forEach(slot => {
+        if (matchesFilters(res)) slot.replaceWith(poolSlot(res, slot.dataset.capacity));
+        else slot.remove();
+      });
+      sprintDetail.querySelectorAll(`.unassign-btn[data-resource-id="${res.id}"]`).forEach(btn => {
+        const item = btn.closest('li');
+        item.querySelector('strong').textContent = res.name;
+        item.querySelector('.resource-meta')?.remove();
+        const meta = metaFor(res);
+        if (meta) item.querySelector('strong').after(meta);
       });
+      syncPoolPlaceholder();
+    }
+
+    function dropResource(resId) {
+      poolSlots(resId).forEach(slot => slot.remove());
+      sprintDetail.querySelectorAll(`.unassign-btn[data-resource-id="${resId}"]`).forEach(btn => {
+        const list = btn.closest('.assignment-list');
+        btn.closest('li').remove();
+        syncAssignmentPlaceholder(list);
+      });
+      syncPoolPlaceholder();
+    }
+
+    // Pool slots and assignment entries carry data-type-id / data-group-id,
+    // so one lookup event patches or drops every resource it touches.
+    function lookupMembers(attr, id) {
+      return Array.from(sprintDetail.querySelectorAll(
+        `.draggable-resource[data-${attr}-id="${id}"], li[data-assignment-id][data-${attr}-id="${id}"]`
+      ));
+    }
+
+    function renameLookup(attr, id, name) {
+      lookupMembers(attr, id).forEach(item => {
+        const label = item.querySelector(`.meta-${attr}`);
+        if (label) label.textContent = name;
+      });
+      const box = sprintDetail.querySelector(`.filter-${attr}[value="${id}"]`);
+      if (box?.nextSibling) box.nextSibling.textContent = ` ${name}`;
+    }
+
+    function dropLookup(attr, id) {
+      const ids = new Set(lookupMembers(attr, id).map(item =>
+        item.dataset.id ?? item.querySelector('.unassign-btn')?.dataset.resourceId));
+      ids.forEach(resId => { if (resId) dropResource(resId); });
+    }
+
+    // ─── Live updates from other planners ────────────────────────
+    const stream = new EventSource(
+      `${sprintDetail.dataset.events}?last_event_id=${sprintDetail.dataset.lastEventId}`
+    );
+    const on = (kind, handler) => stream.addEventListener(kind, ev => handler(JSON.parse(ev.data)));
+
+    on('assigned', data => { if (applyAssigned(data)) resetPoolEntry(data.resource); });
+    on('unassigned', data => { if (applyUnassigned(data)) resetPoolEntry(data.resource); });
+    on('project_added', data => {
+      setRevision(data.revision);
+      if (!projectZone(data.project.id)) {
+        document.querySelector('.projects-container').appendChild(projectCard(data.project));
+      }
+    });
+    on('project_renamed', data => {
+      setRevision(data.revision);
+      const zone = projectZone(data.project.id);
+      if (!zone) return;
+      zone.querySelector('h4').firstChild.textContent = `${data.project.name} `;
+      zone.querySelector('h4 input[name="name"]').value = data.project.name;
     });
+    on('project_deleted', data => {
+      setRevision(data.revision);
+      projectZone(data.project_id)?.remove();
+      data.resources.forEach(resetPoolEntry);
+    });
+    on('resource_added', data => resetPoolEntry(data.resource));
+    on('resource_updated', data => patchResource(data.resource));
+    on('resource_deleted', data => dropResource(data.resource_id));
+    on('type_renamed', data => renameLookup('type', data.type.id, data.type.name));
+    on('group_renamed', data => renameLookup('group', data.group.id, data.group.name));
+    on('type_deleted', data => dropLookup('type', data.type_id));
+    on('group_deleted', data => dropLookup('group', data.group_id));
+    on('reload', () => window.location.reload());
+    on('sprint_deleted', () => { window.location.href = '/sprints'; });
   }
 
   // ─── 2) Resources page → Table + inline row‐edit ───────────────────────
   const resourcesTable = document.getElementById('resources-table');
   if (resourcesTable) {
-    resourcesTable.querySelector('tbody').addEventListener('click', ev => {
+    const tbody = resourcesTable.querySelector('tbody');
+
+    function resourceRow(r) {
+      const tr = document.createElement('tr');
+      tr.dataset.resourceId = r.id;
+      tr.dataset.typeId     = r.type_id ?? '';
+      tr.dataset.groupId    = r.group_id ?? '';
+      [['name-cell', r.name], ['type-cell', r.type_name], ['group-cell', r.group_name]].forEach(([cls, text]) => {
+        const td = document.createElement('td');
+        td.className = cls;
+        td.textContent = text || '';
+        tr.appendChild(td);
+      });
+      const actions = document.createElement('td');
+      actions.className = 'action-cell';
+      actions.innerHTML = `
+        <button class="btn btn-secondary edit-btn" title="Edit"><span class="material-icons">edit</span></button>
+        <button class="btn btn-secondary delete-btn" title="Delete"><span class="material-icons">delete</span></button>
+      `;
+      tr.appendChild(actions);
+      return tr;
+    }
+
+    keysetPager(resourcesTable, rows => rows.forEach(r => tbody.appendChild(resourceRow(r))));
+
+    tbody.addEventListener('click', ev => {
       const tr = ev.target.closest('tr');
       if (!tr) return;
       const rid = tr.dataset.resourceId;
@@ -164,4 +565,78 @@ document.addEventListener('DOMContentLoaded', () => {
       }
     });
   }
+
+  // ─── 5) Capacity heatmap ──────────────────────────────────────────────
+  const heatmap = document.getElementById('capacity-heatmap');
+  if (heatmap) {
+    const section = document.querySelector('.capacity-section');
+    const level   = section.querySelector('.heatmap-level');
+    const tooltip = section.querySelector('.heatmap-tooltip');
+    const CELL = 14, LABEL_W = 180, HEADER_H = 90;
+    let data = null, rows = [];
+
+    // Rows are {name, capacity, used: Array(nSprints)} regardless of level.
+    function buildRows(kind) {
+      const n = data.sprints.id.length;
+      if (kind === 'resources') {
+        const out = data.resources.name.map(name => ({ name, capacity: data.full_capacity, used: new Array(n).fill(0) }));
+        data.cells.resource.forEach((ri, i) => { out[ri].used[data.cells.sprint[i]] = data.cells.used[i]; });
+        return out;
+      }
+      const roll = data[kind];
+      return roll.name.map((name, i) => ({
+        name, capacity: roll.headcount[i] * data.full_capacity, used: roll.used[i]
+      })).filter(r => r.capacity > 0 || r.used.some(u => u > 0));
+    }
+
+    function colour(used, capacity) {
+      if (!used) return '#F2F3FF';
+      if (!capacity || used > capacity) return '#E53E3E';
+      const t = used / capacity;                       // 0..1 → light → primary
+      const mix = (a, b) => Math.round(a + (b - a) * t);
+      return `rgb(${mix(235, 76)},${mix(237, 81)},${mix(255, 191)})`;
+    }
+
+    function draw() {
+      rows = buildRows(level.value);
+      const names = data.sprints.name;
+      heatmap.width  = LABEL_W + names.length * CELL;
+      heatmap.height = HEADER_H + rows.length * CELL;
+      const ctx = heatmap.getContext('2d');
+      ctx.font = '11px sans-serif';
+      ctx.fillStyle = '#2D3748';
+      names.forEach((name, si) => {
+        ctx.save();
+        ctx.translate(LABEL_W + si * CELL + CELL - 3, HEADER_H - 4);
+        ctx.rotate(-Math.PI / 2);
+        ctx.fillText(name.slice(0, 14), 0, 0);
+        ctx.restore();
+      });
+      rows.forEach((row, ri) => {
+        const y = HEADER_H + ri * CELL;
+        ctx.fillStyle = '#2D3748';
+        ctx.fillText(row.name.slice(0, 26), 2, y + CELL - 3);
+        row.used.forEach((u, si) => {
+          ctx.fillStyle = colour(u, row.capacity);
+          ctx.fillRect(LABEL_W + si * CELL, y, CELL - 1, CELL - 1);
+        });
+      });
+    }
+
+    heatmap.addEventListener('mousemove', ev => {
+      if (!data) return;
+      const rect = heatmap.getBoundingClientRect();
+      const si = Math.floor((ev.clientX - rect.left - LABEL_W) / CELL);
+      const ri = Math.floor((ev.clientY - rect.top - HEADER_H) / CELL);
+      const row = rows[ri];
+      if (!row || si < 0 || si >= data.sprints.id.length) return;
+      const pct = row.capacity ? Math.round(100 * row.used[si] / row.capacity) : 0;
+      tooltip.textContent = `${row.name} · ${data.sprints.name[si]}: ${row.used[si]}% allocated (${pct}% of capacity)`;
+    });
+
+    level.addEventListener('change', draw);
+    fetch(section.dataset.source)
+      .then(resp => resp.json())
+      .then(payload => { data = payload; draw(); });
+  }
 });
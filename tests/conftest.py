@@ -1,6 +1,14 @@
 # tests/conftest.py
+import os
+
 import pytest
+
+# The default app is built lazily on first import of `app.app`; point it at a
+# throwaway database so tests never touch DATABASE_URL.
+os.environ['DATABASE_URL'] = os.environ.get('TEST_DATABASE_URL', 'sqlite:///:memory:')
+
 from app import app as flask_app, db
+from lookups import lookup_cache
 
 @pytest.fixture
 def app():
@@ -10,6 +18,7 @@ def app():
     })
     with flask_app.app_context():
         db.create_all()
+    lookup_cache.invalidate()
     yield flask_app
     # teardown
     with flask_app.app_context():
@@ -18,3 +27,18 @@ def app():
 @pytest.fixture
 def client(app):
     return app.test_client()
+
+@pytest.fixture
+def count_queries(app):
+    """Yields a list that collects every SQL statement executed while it is active."""
+    from sqlalchemy import event
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', _record)
+    yield statements
+    event.remove(engine, 'before_cursor_execute', _record)
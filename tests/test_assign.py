@@ -0,0 +1,74 @@
+# tests/test_assign.py
+from app import db, Sprint, Project, Resource, ResourceType
+from models import bump_revision, get_revision
+
+
+def setup_board(app):
+    with app.app_context():
+        t = ResourceType(name='Backend')
+        s = Sprint(name='S1')
+        db.session.add_all([t, s])
+        db.session.flush()
+        r = Resource(name='Alice', type_id=t.id)
+        p = Project(name='P1', sprint_id=s.id)
+        db.session.add_all([r, p])
+        db.session.commit()
+        return s.id, p.id, r.id
+
+
+def test_assign_and_unassign_return_changed_state(app, client):
+    sid, pid, rid = setup_board(app)
+
+    resp = client.post('/assign', json={
+        'sprint_id': sid, 'project_id': pid, 'resource_id': rid, 'capacity': 40
+    })
+    body = resp.get_json()
+    assert body['assignment']['capacity'] == 40
+    assert body['resource']['remaining'] == 60
+    assert body['resource']['type_name'] == 'Backend'
+    assert body['revision'] == 1
+
+    resp = client.post('/unassign', json={
+        'sprint_id': sid, 'project_id': pid, 'resource_id': rid,
+        'assignment_id': body['assignment']['id']
+    })
+    body = resp.get_json()
+    assert body['success'] is True
+    assert body['resource']['remaining'] == 100
+    assert body['revision'] == 2
+
+
+def test_sprint_page_carries_revision(app, client):
+    sid, pid, rid = setup_board(app)
+    client.post(f'/sprints/{sid}/projects', data={'name': 'P2'})
+    resp = client.get(f'/sprints/{sid}')
+    assert b'data-revision="1"' in resp.data
+
+
+def test_assign_rejects_out_of_range_capacity_and_bad_ids(app, client):
+    sid, pid, rid = setup_board(app)
+    base = {'sprint_id': sid, 'project_id': pid, 'resource_id': rid}
+    for bad in ({'capacity': -50}, {'capacity': 0}, {'capacity': 101},
+                {'capacity': 'lots'}, {'resource_id': 'x'}, {'sprint_id': None}):
+        resp = client.post('/assign', json={**base, **bad})
+        assert resp.status_code == 400, bad
+        assert resp.get_json()['success'] is False
+
+    resp = client.post('/assign', json=base)
+    assert resp.get_json()['resource']['remaining'] == 0
+
+
+def test_unassign_rejects_malformed_ids(app, client):
+    sid, pid, rid = setup_board(app)
+    base = {'sprint_id': sid, 'project_id': pid, 'resource_id': rid}
+    for bad in ({'sprint_id': 'abc'}, {'project_id': None}, {'assignment_id': 'x'}):
+        resp = client.post('/unassign', json={**base, **bad})
+        assert resp.status_code == 400, bad
+    assert client.post('/unassign', json=base).status_code == 404
+
+
+def test_first_bump_of_a_revision_key_is_an_upsert(app):
+    with app.app_context():
+        assert [bump_revision('sprint:99') for _ in range(3)] == [1, 2, 3]
+        db.session.commit()
+        assert get_revision('sprint:99') == 3
@@ -0,0 +1,31 @@
+# tests/test_bench.py
+from bench import dataset, harness
+from app import db, Assignment
+
+
+def test_dataset_is_reproducible_and_harness_reports_every_route(app):
+    with app.app_context():
+        written = dataset.generate('tiny', seed=7)
+        first   = [(a.sprint_id, a.resource_id, a.capacity) for a in Assignment.query.order_by(Assignment.id)]
+        assert written == len(first)
+        db.drop_all()
+        db.create_all()
+        dataset.generate('tiny', seed=7)
+        again = [(a.sprint_id, a.resource_id, a.capacity) for a in Assignment.query.order_by(Assignment.id)]
+        assert first == again
+
+    results = harness.run(app, iterations=2, warmup=0)
+    assert set(results) == {'list_sprints', 'view_sprint', 'list_resources',
+                            'assign_resource', 'unassign_resource', 'api_capacity'}
+    for stats in results.values():
+        assert stats['p95_ms'] >= stats['p50_ms'] > 0
+        assert stats['queries'] > 0
+
+
+def test_compare_flags_latency_query_and_memory_regressions():
+    base = {'view_sprint': {'p50_ms': 10.0, 'p95_ms': 20.0, 'queries': 7, 'peak_kb': 800.0}}
+    same = {'view_sprint': {'p50_ms': 11.0, 'p95_ms': 21.0, 'queries': 7, 'peak_kb': 820.0}}
+    bad  = {'view_sprint': {'p50_ms': 30.0, 'p95_ms': 21.0, 'queries': 9, 'peak_kb': 2000.0}}
+    assert harness.compare(base, same) == []
+    flagged = harness.compare(base, bad)
+    assert [line.split(':')[1].split()[0] for line in flagged] == ['p50_ms', 'queries', 'peak_kb']
@@ -0,0 +1,109 @@
+# tests/test_bulk.py
+import threading
+import time
+
+import queries
+from app import create_app, db, Sprint, Project, Resource, Assignment
+from models import init_schema
+
+
+def setup_board(app):
+    with app.app_context():
+        s = Sprint(name='S1')
+        alice, bob = Resource(name='Alice'), Resource(name='Bob')
+        db.session.add_all([s, alice, bob])
+        db.session.flush()
+        p1, p2 = Project(name='P1', sprint_id=s.id), Project(name='P2', sprint_id=s.id)
+        db.session.add_all([p1, p2])
+        db.session.flush()
+        db.session.add(Assignment(sprint_id=s.id, project_id=p1.id, resource_id=alice.id, capacity=60))
+        db.session.commit()
+        return s.id, p1.id, p2.id, alice.id, bob.id
+
+
+def test_bulk_rebalance_is_one_commit(app, client, count_queries):
+    sid, p1, p2, alice, bob = setup_board(app)
+    count_queries.clear()
+    resp = client.post('/assign/bulk', json={'sprint_id': sid, 'operations': [
+        {'op': 'unassign', 'project_id': p1, 'resource_id': alice},
+        {'op': 'assign',   'project_id': p2, 'resource_id': alice, 'capacity': 100},
+        {'op': 'assign',   'project_id': p1, 'resource_id': bob,   'capacity': 50},
+        {'op': 'capacity', 'project_id': p1, 'resource_id': bob,   'capacity': 80},
+    ]})
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body['success'] is True
+    assert [r['remaining'] for r in body['results']] == [100, 0, 50, 20]
+    assert sum(s.startswith('INSERT INTO assignment') for s in count_queries) == 1
+
+    with app.app_context():
+        rows = {(a.project_id, a.resource_id): a.capacity for a in Assignment.query}
+        assert rows == {(p2, alice): 100, (p1, bob): 80}
+
+
+def test_bulk_rejects_overallocation_atomically(app, client):
+    sid, p1, p2, alice, bob = setup_board(app)
+    resp = client.post('/assign/bulk', json={'sprint_id': sid, 'operations': [
+        {'op': 'assign', 'project_id': p2, 'resource_id': bob,   'capacity': 100},
+        {'op': 'assign', 'project_id': p2, 'resource_id': alice, 'capacity': 50},
+        {'op': 'unassign', 'project_id': p2, 'resource_id': 999},
+    ]})
+    assert resp.status_code == 409
+    results = resp.get_json()['results']
+    assert results[0]['success'] is True
+    assert 'only 40% left' in results[1]['error']
+    assert 'not found' in results[2]['error']
+
+    with app.app_context():
+        assert Assignment.query.count() == 1
+
+
+def test_single_assign_enforces_capacity(app, client):
+    sid, p1, p2, alice, bob = setup_board(app)
+    resp = client.post('/assign', json={
+        'sprint_id': sid, 'project_id': p2, 'resource_id': alice, 'capacity': 50
+    })
+    assert resp.status_code == 409
+    assert resp.get_json()['success'] is False
+
+
+def test_single_assign_checks_project_belongs_to_sprint(app, client):
+    sid, p1, p2, alice, bob = setup_board(app)
+    with app.app_context():
+        other = Sprint(name='S2')
+        db.session.add(other)
+        db.session.commit()
+        other_id = other.id
+    resp = client.post('/assign', json={'sprint_id': other_id, 'project_id': p1, 'resource_id': bob})
+    assert resp.status_code == 404
+    assert 'not found in Sprint' in resp.get_json()['error']
+    assert client.post('/assign/bulk', json={'sprint_id': 'abc', 'operations': []}).status_code == 400
+
+
+def test_concurrent_assigns_cannot_overbook(tmp_path, monkeypatch):
+    fresh = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'race.db'}", 'TESTING': True})
+    with fresh.app_context():
+        init_schema()
+    sid, p1, p2, alice, bob = setup_board(fresh)
+
+    real = queries.used_capacity
+    def slow_used_capacity(sprint_id):
+        used = real(sprint_id)
+        time.sleep(0.2)            # widen the gap between the check and the insert
+        return used
+    monkeypatch.setattr(queries, 'used_capacity', slow_used_capacity)
+
+    statuses = []
+    def assign():
+        resp = fresh.test_client().post('/assign', json={
+            'sprint_id': sid, 'project_id': p2, 'resource_id': bob, 'capacity': 60})
+        statuses.append(resp.status_code)
+    threads = [threading.Thread(target=assign) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(statuses) == [200, 409]
+    with fresh.app_context():
+        assert sum(a.capacity for a in Assignment.query.filter_by(resource_id=bob)) == 60
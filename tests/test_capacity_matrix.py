@@ -0,0 +1,47 @@
+# tests/test_capacity_matrix.py
+from app import db, Sprint, Project, Resource, ResourceGroup, Assignment
+
+
+def test_capacity_matrix_rolls_up_and_flags_overallocation(app, client, count_queries):
+    with app.app_context():
+        onshore = ResourceGroup(name='Onshore')
+        s1, s2  = Sprint(name='S1'), Sprint(name='S2')
+        db.session.add_all([onshore, s1, s2])
+        db.session.flush()
+        alice = Resource(name='Alice', group_id=onshore.id)
+        bob   = Resource(name='Bob')
+        p1, p2 = Project(name='P1', sprint_id=s1.id), Project(name='P2', sprint_id=s2.id)
+        db.session.add_all([alice, bob, p1, p2])
+        db.session.flush()
+        db.session.add_all([
+            Assignment(sprint_id=s1.id, project_id=p1.id, resource_id=alice.id, capacity=80),
+            Assignment(sprint_id=s1.id, project_id=p1.id, resource_id=alice.id, capacity=40),
+            Assignment(sprint_id=s2.id, project_id=p2.id, resource_id=bob.id,   capacity=50),
+        ])
+        db.session.commit()
+
+    client.get('/resources')  # warm the lookup cache
+    count_queries.clear()
+    body = client.get('/api/capacity').get_json()
+    assert len(count_queries) == 3
+
+    assert body['sprints']['name'] == ['S1', 'S2']
+    assert body['resources']['name'] == ['Alice', 'Bob']
+    cells = list(zip(body['cells']['resource'], body['cells']['sprint'], body['cells']['used']))
+    assert sorted(cells) == [(0, 0, 120), (1, 1, 50)]
+    assert [cells[i] for i in body['over_allocated']] == [(0, 0, 120)]
+
+    by_group = body['by_group']
+    assert by_group['name'] == ['Onshore', '(none)']
+    assert by_group['headcount'] == [1, 1]
+    assert by_group['used'] == [[120, 0], [0, 50]]
+    assert by_group['over'] == {'row': [0], 'sprint': [0]}
+
+
+def test_capacity_matrix_sprint_filter_and_page(client):
+    client.post('/sprints', data={'name': 'S1'})
+    client.post('/sprints', data={'name': 'S2'})
+    body = client.get('/api/capacity?sprint_ids=2').get_json()
+    assert body['sprints'] == {'id': [2], 'name': ['S2']}
+    assert client.get('/api/capacity?sprint_ids=x').status_code == 400
+    assert client.get('/capacity').status_code == 200
@@ -0,0 +1,52 @@
+# tests/test_etags.py
+from app import db, Sprint
+
+
+def test_sprint_page_revalidates_until_assignment_changes(app, client, count_queries):
+    client.post('/resources', data={'name': 'Alice'})
+    client.post('/sprints', data={'name': 'S1'})
+    with app.app_context():
+        sid = Sprint.query.first().id
+    client.post(f'/sprints/{sid}/projects', data={'name': 'P1'})
+
+    resp = client.get(f'/sprints/{sid}')
+    etag = resp.headers['ETag']
+    assert resp.status_code == 200
+
+    count_queries.clear()
+    resp = client.get(f'/sprints/{sid}', headers={'If-None-Match': etag})
+    assert resp.status_code == 304
+    assert len(count_queries) == 1
+
+    client.post('/assign', json={'sprint_id': sid, 'project_id': 1, 'resource_id': 1, 'capacity': 50})
+    resp = client.get(f'/sprints/{sid}', headers={'If-None-Match': etag})
+    assert resp.status_code == 200
+    assert resp.headers['ETag'] != etag
+
+
+def test_lookup_pages_share_global_revision(client):
+    etags = {url: client.get(url).headers['ETag'] for url in ('/resources', '/types', '/groups')}
+    for url, etag in etags.items():
+        assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+    client.post('/groups', data={'name': 'Onshore'})
+    for url, etag in etags.items():
+        assert client.get(url, headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_json_variant_uses_its_own_etag(client):
+    client.post('/sprints', data={'name': 'S1'})
+    html = client.get('/sprints')
+    api  = client.get('/api/sprints')
+    assert api.get_json() == {'sprints': [{'id': 1, 'name': 'S1'}]}
+    assert api.headers['ETag'] != html.headers['ETag']
+    assert client.get('/api/sprints', headers={'If-None-Match': api.headers['ETag']}).status_code == 304
+
+
+def test_flash_message_bypasses_304(client):
+    client.post('/types', data={'name': 'Backend'})
+    etag = client.get('/types').headers['ETag']
+    client.post('/types', data={'name': 'Backend'})  # duplicate → flash, no revision bump
+    resp = client.get('/types', headers={'If-None-Match': etag})
+    assert resp.status_code == 200
+    assert b'already exists' in resp.data
@@ -0,0 +1,176 @@
+# tests/test_events.py
+import json
+
+import events
+from app import db, Sprint, Project, Resource, ResourceType, ResourceGroup
+from models import SprintEvent
+
+
+def seed(app):
+    with app.app_context():
+        s1, s2 = Sprint(name='S1'), Sprint(name='S2')
+        alice = Resource(name='Alice')
+        db.session.add_all([s1, s2, alice])
+        db.session.flush()
+        p = Project(name='P1', sprint_id=s1.id)
+        db.session.add(p)
+        db.session.commit()
+        return s1.id, s2.id, p.id, alice.id
+
+
+def assign(client, sid, pid, rid, capacity=60):
+    return client.post('/assign', json={'sprint_id': sid, 'project_id': pid,
+                                        'resource_id': rid, 'capacity': capacity})
+
+
+def drain(sub):
+    out = []
+    while not sub.queue.empty():
+        out.append(sub.queue.get_nowait())
+    return out
+
+
+def test_write_routes_record_events_only_when_they_commit(app, client):
+    sid, _, pid, rid = seed(app)
+    assert assign(client, sid, pid, rid).status_code == 200
+    assert assign(client, sid, pid, rid).status_code == 409
+    client.post(f'/sprints/{sid}/projects', data={'name': 'P2'})
+    client.post(f'/resources/edit/{rid}', data={'name': 'Alicia'})
+
+    with app.app_context():
+        rows = SprintEvent.query.order_by(SprintEvent.id).all()
+        assert [(e.sprint_id, e.kind) for e in rows] == [
+            (sid, 'assigned'), (sid, 'project_added'), (None, 'resource_updated')
+        ]
+        delta = json.loads(rows[0].payload)
+        assert delta['assignment']['capacity'] == 60
+        assert delta['resource']['remaining'] == 40
+        assert json.loads(rows[2].payload)['resource']['name'] == 'Alicia'
+
+
+def test_local_broker_fans_out_by_sprint(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, 'EVENTS_BACKEND', 'local')
+    sid, other, pid, rid = seed(app)
+    broker = app.extensions['events'].broker
+    mine, theirs = broker.subscribe(sid), broker.subscribe(other)
+    try:
+        assign(client, sid, pid, rid)
+        client.post('/resources', data={'name': 'Bob'})
+        assert [e.kind for e in drain(mine)] == ['assigned', 'resource_added']
+        assert [e.kind for e in drain(theirs)] == ['resource_added']
+    finally:
+        broker.unsubscribe(mine)
+        broker.unsubscribe(theirs)
+    assert broker.subscribers() == 0
+
+
+def test_database_broker_polls_committed_events(app, client, monkeypatch):
+    sid, _, pid, rid = seed(app)
+    broker = events.DatabaseBroker(app)
+    monkeypatch.setattr(broker, 'start', lambda: None)
+    sub = broker.subscribe(sid)
+    broker.poll()                      # first poll only sets the starting point
+    assign(client, sid, pid, rid)
+    broker.poll()
+    assert [e.kind for e in drain(sub)] == ['assigned']
+    broker.poll()
+    assert drain(sub) == []
+
+
+def test_database_broker_waits_for_late_commits(app, monkeypatch):
+    broker = events.DatabaseBroker(app)
+    monkeypatch.setattr(broker, 'start', lambda: None)
+    sub = broker.subscribe(None)
+    broker.poll()
+
+    def commit(*ids):
+        with app.app_context():
+            db.session.add_all([SprintEvent(id=i, kind='late', payload='{}') for i in ids])
+            db.session.commit()
+
+    # Id 2 belongs to a slow transaction that commits after hundreds of newer ones.
+    commit(1, *range(3, 400))
+    broker.poll()
+    assert len(drain(sub)) == 398
+    commit(2)
+    broker.poll()
+    assert [e.id for e in drain(sub)] == [2]
+    assert broker._floor == 399
+
+    # A gap that stays open past the timeout is given up on.
+    commit(401)
+    broker.poll()
+    assert broker._floor == 399
+    monkeypatch.setattr(broker, 'gap_timeout', 0)
+    broker.poll()
+    assert broker._floor == 401
+    assert [e.id for e in drain(sub)] == [401]
+
+
+def test_stream_replays_after_last_event_id(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, 'EVENTS_BACKEND', 'local')
+    monkeypatch.setitem(app.config, 'EVENTS_KEEPALIVE', 0.01)
+    sid, other, pid, rid = seed(app)
+    assign(client, sid, pid, rid, capacity=10)
+    with app.app_context():
+        first = events.latest_id()
+    assign(client, sid, pid, rid, capacity=20)
+    client.post(f'/sprints/{other}/projects', data={'name': 'Elsewhere'})
+
+    resp = client.get(f'/sprints/{sid}/events', headers={'Last-Event-ID': str(first)})
+    assert resp.mimetype == 'text/event-stream'
+    chunks = iter(resp.response)
+    assert next(chunks) == b'retry: 3000\n\n'
+    replayed = next(chunks).decode()
+    assert replayed.startswith(f'id: {first + 1}\nevent: assigned\n')
+    assert '"capacity": 20' in replayed
+    assert next(chunks) == b': keepalive\n\n'
+    resp.close()
+    assert app.extensions['events'].broker.subscribers() == 0
+
+
+def test_stream_asks_for_reload_when_events_were_pruned(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, 'EVENTS_BACKEND', 'local')
+    sid, _, pid, rid = seed(app)
+    assign(client, sid, pid, rid, capacity=10)
+    assign(client, sid, pid, rid, capacity=10)
+    assign(client, sid, pid, rid, capacity=10)
+    with app.app_context():
+        SprintEvent.query.filter(SprintEvent.id < 3).delete()
+        db.session.commit()
+
+    resp = client.get(f'/sprints/{sid}/events?last_event_id=0')
+    assert b''.join(resp.response) == b'retry: 3000\n\nevent: reload\ndata: {}\n\n'
+
+
+def test_streams_over_the_cap_are_told_to_retry_later(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, 'EVENTS_BACKEND', 'local')
+    monkeypatch.setitem(app.config, 'EVENTS_MAX_STREAMS', 1)
+    sid, *_ = seed(app)
+    held = app.extensions['events'].broker.subscribe(sid)
+    try:
+        resp = client.get(f'/sprints/{sid}/events')
+        body = resp.get_data(as_text=True)
+        assert resp.mimetype == 'text/event-stream'
+        assert body.startswith('retry: ') and 'event:' not in body
+        assert app.extensions['events'].broker.subscribers() == 1
+    finally:
+        app.extensions['events'].broker.unsubscribe(held)
+
+
+def test_type_and_group_changes_reach_open_boards(app, client):
+    with app.app_context():
+        t, grp = ResourceType(name='Backend'), ResourceGroup(name='Onshore')
+        db.session.add_all([t, grp])
+        db.session.flush()
+        db.session.add_all([Resource(name='Alice', type_id=t.id), Resource(name='Bob', group_id=grp.id)])
+        db.session.commit()
+        tid, gid = t.id, grp.id
+
+    client.post(f'/types/edit/{tid}', data={'name': 'Platform'})
+    client.post(f'/groups/delete/{gid}')
+    with app.app_context():
+        rows = SprintEvent.query.order_by(SprintEvent.id).all()
+        assert [(e.sprint_id, e.kind) for e in rows] == [(None, 'type_renamed'), (None, 'group_deleted')]
+        assert json.loads(rows[0].payload) == {'type': {'id': tid, 'name': 'Platform'}}
+        assert json.loads(rows[1].payload) == {'group_id': gid}
@@ -0,0 +1,48 @@
+# tests/test_export.py
+import csv
+import io
+import json
+
+from app import db, Sprint, Project, Resource, ResourceType, Assignment
+
+
+def seed(app):
+    with app.app_context():
+        backend = ResourceType(name='Backend')
+        s1, s2  = Sprint(name='S1'), Sprint(name='S2')
+        db.session.add_all([backend, s1, s2])
+        db.session.flush()
+        alice, bob = Resource(name='Alice', type_id=backend.id), Resource(name='Bob')
+        p1, p2 = Project(name='P1', sprint_id=s1.id), Project(name='P2', sprint_id=s2.id)
+        db.session.add_all([alice, bob, p1, p2])
+        db.session.flush()
+        db.session.add_all([
+            Assignment(sprint_id=s1.id, project_id=p1.id, resource_id=alice.id, capacity=60),
+            Assignment(sprint_id=s1.id, project_id=p1.id, resource_id=bob.id,   capacity=40),
+            Assignment(sprint_id=s2.id, project_id=p2.id, resource_id=alice.id, capacity=100),
+        ])
+        db.session.commit()
+        return s1.id, s2.id, backend.id
+
+
+def test_csv_export_of_one_sprint(app, client):
+    s1, s2, backend = seed(app)
+    resp = client.get(f'/export/assignments.csv?sprint_ids={s1}')
+    assert resp.is_streamed
+    assert resp.mimetype == 'text/csv'
+    rows = list(csv.DictReader(io.StringIO(resp.get_data(as_text=True))))
+    assert [(r['resource_name'], r['type_name'], r['capacity']) for r in rows] == [
+        ('Alice', 'Backend', '60'), ('Bob', '', '40'),
+    ]
+
+
+def test_ndjson_export_filters_in_sql(app, client):
+    s1, s2, backend = seed(app)
+    resp = client.get(f'/export/assignments.ndjson?type_ids={backend}&from_sprint={s1}&to_sprint={s2}')
+    lines = [json.loads(l) for l in resp.get_data(as_text=True).splitlines()]
+    assert [(l['sprint_name'], l['project_name'], l['capacity']) for l in lines] == [
+        ('S1', 'P1', 60), ('S2', 'P2', 100),
+    ]
+    assert client.get('/export/assignments.csv?group_ids=x').status_code == 400
+    assert client.get('/export/assignments.csv?from_sprint=abc').status_code == 400
+    assert client.get('/export/assignments.ndjson?to_sprint=1.5').status_code == 400
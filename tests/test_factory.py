@@ -0,0 +1,95 @@
+# tests/test_factory.py
+import gc
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import inspect, text
+
+import app as app_module
+from app import create_app, db
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_has_no_side_effects():
+    env = {k: v for k, v in os.environ.items() if k != 'DATABASE_URL'}
+    out = subprocess.run(
+        [sys.executable, '-c', "import app; print('app' in vars(app))"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    assert out.stdout.strip() == 'False'
+
+
+def test_create_app_without_database_url_falls_back_to_sqlite(monkeypatch):
+    monkeypatch.delenv('DATABASE_URL', raising=False)
+    app = create_app()
+    assert app.config['SQLALCHEMY_DATABASE_URI'].endswith('data.db')
+    with app.app_context():
+        assert db.engine.dialect.name == 'sqlite'
+
+
+def collect():
+    gc.collect()
+    gc.collect()    # the engines' own cycles are only freed on a second pass
+
+
+def test_fork_hook_does_not_keep_engines_alive():
+    collect()
+    before = len(app_module._engines)
+    for _ in range(3):
+        create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
+    collect()
+    assert len(app_module._engines) == before
+
+
+def test_apps_do_not_share_metrics_or_brokers():
+    one = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'EVENTS_BACKEND': 'local'})
+    two = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'EVENTS_BACKEND': 'local'})
+    assert one.extensions['instrumentation'] is not two.extensions['instrumentation']
+
+    sub = one.extensions['events'].broker.subscribe(1)
+    one.test_client().get('/metrics')
+    assert two.extensions['events'].broker.subscribers() == 0
+    assert 'sse_clients 1' in one.test_client().get('/metrics').get_data(as_text=True)
+    body = two.test_client().get('/metrics').get_data(as_text=True)
+    assert 'sse_clients 0' in body
+    assert 'endpoint="metrics"' not in body
+    one.extensions['events'].broker.unsubscribe(sub)
+
+
+def test_init_db_creates_schema_on_demand(tmp_path):
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'fresh.db'}"})
+    with app.app_context():
+        assert inspect(db.engine).get_table_names() == []
+
+    result = app.test_cli_runner().invoke(args=['init-db'])
+    assert result.exit_code == 0, result.output
+
+    with app.app_context():
+        tables = set(inspect(db.engine).get_table_names())
+        assert {'sprint', 'resource', 'assignment', 'revision', 'sprint_event'} <= tables
+        assert db.session.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert db.engine.pool._pre_ping
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="needs fork()")
+def test_forked_child_does_not_reuse_parent_connections(tmp_path):
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'fork.db'}"})
+    with app.app_context():
+        db.session.execute(text('SELECT 1'))
+        db.session.remove()
+        assert db.engine.pool.checkedin() == 1
+
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            with app.app_context():
+                fresh = db.engine.pool.checkedin() == 0
+                code = 0 if fresh and db.session.execute(text('SELECT 1')).scalar() == 1 else 1
+        finally:
+            os._exit(code)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
@@ -0,0 +1,77 @@
+# tests/test_import.py
+import io
+
+from app import app as flask_app, db, Sprint, Resource, ResourceType, ResourceGroup, Assignment
+
+
+def test_import_types_and_resources_upserts_by_name(app, client):
+    resp = client.post('/import/types?format=csv', data=b"name\nBackend\nFrontend\nBackend\n")
+    assert resp.get_json()['inserted'] == 2
+
+    client.post('/resources', data={'name': 'Alice'})
+    csv_body = b"name,type,group\nAlice,Backend,\nBob,Frontend,\nCarol,Design,\n,Backend,\n"
+    resp = client.post('/import/resources', data={'file': (io.BytesIO(csv_body), 'people.csv')})
+    report = resp.get_json()
+    assert report['success'] is False
+    assert (report['inserted'], report['updated']) == (1, 1)
+    assert report['errors'] == [
+        {'row': 3, 'error': "unknown type 'Design'"},
+        {'row': 4, 'error': "'name' is required"},
+    ]
+    with app.app_context():
+        types = {t.id: t.name for t in ResourceType.query}
+        assert {r.name: types[r.type_id] for r in Resource.query} == {'Alice': 'Backend', 'Bob': 'Frontend'}
+    assert b'Bob' in client.get('/resources').data
+
+
+def test_import_assignments_ndjson_creates_projects_and_checks_capacity(app, client):
+    client.post('/sprints', data={'name': 'S1'})
+    client.post('/resources', data={'name': 'Alice'})
+    body = b'\n'.join([
+        b'{"sprint_id": 1, "project": "Apollo", "resource": "Alice", "capacity": 60}',
+        b'{"sprint_id": 1, "project": "Apollo", "resource": "Alice", "capacity": 60}',
+        b'{"sprint_id": 9, "project": "Apollo", "resource": "Alice"}',
+        b'not json',
+    ])
+    resp = client.post('/import/assignments', data=body, content_type='application/x-ndjson')
+    report = resp.get_json()
+    assert report['inserted'] == 1
+    assert [e['row'] for e in report['errors']] == [2, 3, 4]
+    with app.app_context():
+        sprint = db.session.get(Sprint, 1)
+        assert [p.name for p in sprint.projects] == ['Apollo']
+        assert [a.capacity for a in Assignment.query] == [60]
+
+
+def test_import_cli_command(app, tmp_path):
+    path = tmp_path / 'groups.csv'
+    path.write_text("name\nOnshore\nOffshore\n")
+    result = flask_app.test_cli_runner().invoke(args=['import', 'groups', str(path)])
+    assert result.exit_code == 0
+    assert '"inserted": 2' in result.output
+
+
+def test_import_reports_non_object_lines_and_rejects_bad_encoding(app, client):
+    body = b'{"name": "Onshore"}\n42\n["x"]\n'
+    report = client.post('/import/groups', data=body, content_type='application/x-ndjson').get_json()
+    assert report['inserted'] == 1
+    assert report['errors'] == [{'row': 2, 'error': 'each line must be a JSON object'},
+                                {'row': 3, 'error': 'each line must be a JSON object'}]
+
+    resp = client.post('/import/groups?format=csv', data=b'name\nOffshore\n\xff\xfe\n')
+    assert resp.status_code == 400
+    assert 'UTF-8' in resp.get_json()['error']
+    with app.app_context():
+        assert [g.name for g in ResourceGroup.query] == ['Onshore']
+
+
+def test_import_assignments_loads_only_referenced_sprints(app, client, count_queries):
+    for name in ('S1', 'S2'):
+        client.post('/sprints', data={'name': name})
+    client.post('/resources', data={'name': 'Alice'})
+    count_queries.clear()
+    body = b'{"sprint_id": 1, "project": "Apollo", "resource": "Alice", "capacity": 60}'
+    report = client.post('/import/assignments', data=body, content_type='application/x-ndjson').get_json()
+    assert report['inserted'] == 1
+    preloads = [q for q in count_queries if q.lstrip().startswith('SELECT') and 'assignment' in q]
+    assert preloads and all('sprint_id IN' in q for q in preloads)
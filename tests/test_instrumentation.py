@@ -0,0 +1,50 @@
+# tests/test_instrumentation.py
+import logging
+
+from sqlalchemy import text
+
+from app import create_app, db
+
+
+def test_server_timing_header_and_metrics(client):
+    client.post('/sprints', data={'name': 'S1'})
+    resp = client.get('/sprints/1')
+    timing = resp.headers['Server-Timing']
+    assert timing.startswith('app;dur=')
+    assert 'sql;dur=' in timing and 'tpl;dur=' in timing
+
+    body = client.get('/metrics').get_data(as_text=True)
+    assert '# TYPE http_request_duration_seconds histogram' in body
+    assert 'http_request_duration_seconds_bucket{endpoint="view_sprint",le="+Inf"}' in body
+    assert 'sql_statements_total{endpoint="view_sprint"}' in body
+    assert 'template_seconds_total{endpoint="view_sprint"}' in body
+
+
+def test_slow_query_log_includes_statement_and_params(app, client, caplog):
+    app.config.update(SLOW_QUERY_MS=0, SLOW_REQUEST_MS=0)
+    try:
+        with caplog.at_level(logging.WARNING, logger='capacity_planner.slow'):
+            client.get('/sprints/42')
+    finally:
+        app.config.update(SLOW_QUERY_MS=100, SLOW_REQUEST_MS=500)
+    messages = [r.getMessage() for r in caplog.records]
+    assert any('Slow query' in m and 'FROM sprint' in m and '42' in m for m in messages)
+    assert any(m.startswith('Slow request GET /sprints/42') for m in messages)
+
+
+def test_sql_timing_is_per_app(app, caplog):
+    quiet = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'METRICS_ENABLED': False, 'SLOW_QUERY_MS': 0})
+    app.config.update(SLOW_QUERY_MS=0)
+    slow = logging.getLogger('capacity_planner.slow')
+    slow.addHandler(caplog.handler)     # create_app() re-ran dictConfig on the root logger
+    try:
+        with quiet.app_context():
+            db.session.execute(text('SELECT 1 AS quiet_app'))
+        with app.app_context():
+            db.session.execute(text('SELECT 2 AS timed_app'))
+    finally:
+        slow.removeHandler(caplog.handler)
+        app.config.update(SLOW_QUERY_MS=100)
+    messages = [r.getMessage() for r in caplog.records]
+    assert not any('quiet_app' in m for m in messages)
+    assert any('timed_app' in m for m in messages)
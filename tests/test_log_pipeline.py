@@ -0,0 +1,89 @@
+# tests/test_log_pipeline.py
+import json
+import logging
+import sys
+
+from log_pipeline import LogPipeline, BoundedQueueHandler, RotatingWriter
+
+
+def make_logger(pipeline):
+    logger = logging.getLogger('test.pipeline')
+    logger.handlers = [BoundedQueueHandler(pipeline)]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def test_records_are_written_as_json_lines_with_request_context(app, tmp_path):
+    path     = tmp_path / 'app.log'
+    pipeline = LogPipeline(path=str(path), stdout=False)
+    logger   = make_logger(pipeline)
+    with app.test_request_context('/sprints/3', headers={'X-Request-ID': 'abc'}):
+        app.preprocess_request()
+        logger.info("Added Project(id=7) to Sprint(id=3)", extra={'duration_ms': 1.5})
+    pipeline.stop()
+
+    doc = json.loads(path.read_text().splitlines()[0])
+    assert doc['message'] == "Added Project(id=7) to Sprint(id=3)"
+    assert doc['entities'] == {'Project': 7, 'Sprint': 3}
+    assert doc['request_id'] == 'abc'
+    assert doc['route'] == '/sprints/<int:sprint_id>'
+    assert doc['duration_ms'] == 1.5
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    pipeline = LogPipeline(path=str(tmp_path / 'app.log'), queue_size=2, stdout=False)
+    pipeline.ensure_started = lambda: None   # no listener: the queue just fills up
+    logger = make_logger(pipeline)
+    for i in range(5):
+        logger.info("message %d", i)
+    assert pipeline.dropped == 3
+
+
+def test_rotating_writer_rolls_over_by_size(tmp_path):
+    path   = tmp_path / 'app.log'
+    writer = RotatingWriter(str(path), max_bytes=20, backups=2)
+    for i in range(4):
+        writer.write(f"line {i:012d}\n")
+    writer.close()
+    assert path.read_text() == "line 000000000003\n"
+    assert (tmp_path / 'app.log.1').read_text() == "line 000000000002\n"
+    assert (tmp_path / 'app.log.2').exists()
+    assert not (tmp_path / 'app.log.3').exists()
+
+
+def test_rotating_writers_in_several_workers_share_one_file(tmp_path):
+    path   = tmp_path / 'app.log'
+    first  = RotatingWriter(str(path), max_bytes=40, backups=2)
+    second = RotatingWriter(str(path), max_bytes=40, backups=2)
+    for writer, text in ((first, "a"), (second, "b"),
+                         (first, "c"),      # 54 bytes: rotates the shared file
+                         (second, "d")):    # follows the rotation instead of writing to .1
+        writer.write(text * 17 + "\n")
+        writer.flush()                      # the listener flushes after every batch
+    first.close()
+    second.close()
+    assert (tmp_path / 'app.log.1').read_text() == "a" * 17 + "\n" + "b" * 17 + "\n"
+    assert path.read_text() == "c" * 17 + "\n" + "d" * 17 + "\n"
+    assert not (tmp_path / 'app.log.2').exists()
+
+
+def test_responses_carry_request_id(client):
+    resp = client.get('/sprints', headers={'X-Request-ID': 'req-1'})
+    assert resp.headers['X-Request-ID'] == 'req-1'
+    assert 'log_records_dropped_total' in client.get('/metrics').get_data(as_text=True)
+
+
+def test_handler_leaves_the_callers_record_intact(tmp_path):
+    pipeline = LogPipeline(path=str(tmp_path / 'app.log'), stdout=False)
+    pipeline.ensure_started = lambda: None
+    handler = BoundedQueueHandler(pipeline)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.getLogger('test').makeRecord(
+            'test', logging.ERROR, __file__, 1, "failed %s", ('job',), sys.exc_info())
+    handler.emit(record)
+    assert record.args == ('job',) and record.exc_info is not None
+    queued = pipeline.queue.get_nowait()
+    assert queued.getMessage() == "failed job" and 'ValueError: boom' in queued.exc_text
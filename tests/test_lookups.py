@@ -0,0 +1,67 @@
+# tests/test_lookups.py
+from app import db
+from lookups import lookup_cache
+from models import Revision, LOOKUPS_KEY
+
+
+def test_cache_serves_repeat_reads_and_invalidates_on_crud(client):
+    client.post('/types', data={'name': 'Backend'})
+    client.get('/types')
+    misses = lookup_cache.misses
+    client.get('/resources')
+    client.get('/groups')
+    assert lookup_cache.misses == misses
+
+    client.post('/types/edit/1', data={'name': 'Frontend'})
+    resp = client.get('/types')
+    assert b'Frontend' in resp.data
+    assert lookup_cache.misses == misses + 1
+
+
+def test_other_worker_change_is_seen_through_revision_row(app, client):
+    client.post('/resources', data={'name': 'Alice'})
+    assert b'Alice' in client.get('/resources').data
+
+    # Simulate another worker: write directly and bump the shared revision row.
+    with app.app_context():
+        db.session.execute(db.text("UPDATE resource SET name = 'Alicia'"))
+        db.session.get(Revision, LOOKUPS_KEY).value += 1
+        db.session.commit()
+    assert b'Alicia' in client.get('/resources').data
+
+
+def test_cache_stats_endpoint(client):
+    client.get('/types')
+    client.get('/groups')
+    stats = client.get('/api/cache').get_json()['lookups']
+    assert stats['hits'] >= 1
+    assert stats['misses'] >= 1
+
+
+def test_directory_over_the_cap_is_bypassed_not_reloaded(app, client, monkeypatch):
+    monkeypatch.setattr(lookup_cache, 'max_resources', 1)
+    client.post('/sprints', data={'name': 'S1'})
+    client.post('/sprints/1/projects', data={'name': 'P1'})
+    for name in ('Alice', 'Bob'):
+        client.post('/resources', data={'name': name})
+    assert client.post('/assign', json={'sprint_id': 1, 'project_id': 1, 'resource_id': 2,
+                                        'capacity': 50}).get_json()['resource']['name'] == 'Bob'
+
+    client.get('/sprints/1')
+    misses = lookup_cache.misses
+    html = client.get('/sprints/1').get_data(as_text=True)
+    assert lookup_cache.misses == misses
+    assert '<strong>Bob</strong>' in html
+    assert client.get('/api/cache').get_json()['lookups']['directory_cached'] is False
+
+
+def test_board_renders_resources_missing_from_the_snapshot(app, client):
+    client.post('/sprints', data={'name': 'S1'})
+    client.post('/sprints/1/projects', data={'name': 'P1'})
+    client.get('/resources')                 # snapshot without Carol
+    with app.app_context():
+        db.session.execute(db.text("INSERT INTO resource (name) VALUES ('Carol')"))
+        db.session.execute(db.text(
+            "INSERT INTO assignment (sprint_id, project_id, resource_id, capacity) VALUES (1, 1, 1, 40)"))
+        db.session.commit()
+    assert '<strong>Carol</strong>' in client.get('/sprints/1').get_data(as_text=True)
@@ -0,0 +1,106 @@
+# tests/test_pagination.py
+import queries
+from app import db, Sprint, Project, Resource, ResourceType, ResourceGroup, Assignment
+
+
+def seed(app, n_resources=25):
+    with app.app_context():
+        backend, frontend = ResourceType(name='Backend'), ResourceType(name='Frontend')
+        onshore = ResourceGroup(name='Onshore')
+        s = Sprint(name='S1')
+        db.session.add_all([backend, frontend, onshore, s])
+        db.session.flush()
+        p = Project(name='P1', sprint_id=s.id)
+        resources = [
+            Resource(name=f'R{i:03d}', type=backend if i % 2 else frontend, group=onshore if i % 5 == 0 else None)
+            for i in range(n_resources)
+        ]
+        db.session.add_all([p] + resources)
+        db.session.flush()
+        # R000 and R003 are fully booked, R001 is half booked.
+        db.session.add_all([
+            Assignment(sprint_id=s.id, project_id=p.id, resource_id=resources[0].id, capacity=100),
+            Assignment(sprint_id=s.id, project_id=p.id, resource_id=resources[1].id, capacity=50),
+            Assignment(sprint_id=s.id, project_id=p.id, resource_id=resources[3].id, capacity=60),
+            Assignment(sprint_id=s.id, project_id=p.id, resource_id=resources[3].id, capacity=40),
+        ])
+        db.session.commit()
+        return s.id, backend.id, onshore.id
+
+
+def walk(client, url, **params):
+    names = []
+    while True:
+        data = client.get(url, query_string=params).get_json()
+        names += [r['name'] for r in data['resources']]
+        if data['next'] is None:
+            return names, data
+        params.update(data['next'])
+
+
+def test_pool_pages_cover_available_resources_once(app, client):
+    sid, _, _ = seed(app)
+    names, _ = walk(client, f'/api/sprints/{sid}/pool', limit=7)
+    assert names == [f'R{i:03d}' for i in range(25) if i not in (0, 3)]
+
+    first = client.get(f'/api/sprints/{sid}/pool?limit=2').get_json()
+    assert first['resources'][0] == {
+        'id': first['resources'][0]['id'], 'name': 'R001',
+        'type_id': first['resources'][0]['type_id'], 'type_name': 'Backend',
+        'group_id': None, 'group_name': None, 'remaining': 50,
+    }
+    assert first['next'] == {'after_name': 'R002', 'after_id': first['resources'][1]['id']}
+
+
+def test_pool_filters_are_applied_in_sql(app, client):
+    sid, backend, onshore = seed(app)
+    names, _ = walk(client, f'/api/sprints/{sid}/pool', type_ids=backend, group_ids=onshore)
+    assert names == ['R005', 'R015']
+
+    names, _ = walk(client, f'/api/sprints/{sid}/pool', q='R00', limit=3)
+    assert names == ['R001', 'R002', 'R004', 'R005', 'R006', 'R007', 'R008', 'R009']
+
+
+def test_prefix_filter_escapes_like_wildcards(app):
+    with app.app_context():
+        db.session.add_all([Resource(name='a_b'), Resource(name='axb'), Resource(name='50%'), Resource(name='500')])
+        db.session.commit()
+        assert [r['name'] for r in queries.resources_page(prefix='a_')[0]] == ['a_b']
+        assert [r['name'] for r in queries.resources_page(prefix='50%')[0]] == ['50%']
+
+
+def test_api_resources_is_paginated(app, client):
+    seed(app)
+    names, last = walk(client, '/api/resources', limit=10)
+    assert names == [f'R{i:03d}' for i in range(25)]
+    assert last['next'] is None
+    assert client.get('/api/resources?type_ids=x').status_code == 400
+
+
+def test_pages_render_only_the_first_page(app, client):
+    sid, _, _ = seed(app, n_resources=queries.PAGE_SIZE + 20)
+    html = client.get(f'/sprints/{sid}').get_data(as_text=True)
+    # R000 and R003 are fully booked, so the first pool page ends at R101.
+    assert 'data-after-name="R101"' in html
+    assert 'R102' not in html
+
+    html = client.get('/resources').get_data(as_text=True)
+    assert 'data-after-name="R099"' in html
+    assert 'R100' not in html
+
+
+def test_malformed_cursor_is_rejected_not_reset(app, client):
+    sid, _, _ = seed(app)
+    for qs in ('after_name=R005&after_id=abc', 'after_name=R005', 'after_id=3'):
+        assert client.get(f'/api/sprints/{sid}/pool?{qs}').status_code == 400, qs
+        assert client.get(f'/api/resources?{qs}').status_code == 400, qs
+
+
+def test_prefix_filter_is_case_insensitive_and_board_api_links_the_pool(app, client):
+    sid, _, _ = seed(app)
+    names, _ = walk(client, '/api/resources', q='r01')
+    assert names == [f'R{i:03d}' for i in range(10, 20)]
+
+    board = client.get(f'/api/sprints/{sid}').get_json()
+    assert 'available' not in board
+    assert board['pool'] == f'/api/sprints/{sid}/pool'
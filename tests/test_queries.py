@@ -0,0 +1,77 @@
+# tests/test_queries.py
+import queries
+from lookups import lookup_cache
+from app import db, Sprint, Project, Resource, ResourceType, ResourceGroup, Assignment
+
+
+def seed_sprint(app, n_projects, n_resources):
+    with app.app_context():
+        t = ResourceType(name='Backend')
+        g = ResourceGroup(name='Onshore')
+        s = Sprint(name='S1')
+        db.session.add_all([t, g, s])
+        db.session.flush()
+        projects  = [Project(name=f'P{i}', sprint_id=s.id) for i in range(n_projects)]
+        resources = [Resource(name=f'R{i:04d}', type=t, group=g) for i in range(n_resources)]
+        db.session.add_all(projects + resources)
+        db.session.flush()
+        for i, r in enumerate(resources):
+            db.session.add(Assignment(
+                sprint_id=s.id, project_id=projects[i % n_projects].id,
+                resource_id=r.id, capacity=50
+            ))
+        db.session.commit()
+        return s.id
+
+
+def test_pool_uses_grouped_totals(app):
+    with app.app_context():
+        s = Sprint(name='S1')
+        alice, bob, carol = Resource(name='Alice'), Resource(name='Bob'), Resource(name='Carol')
+        db.session.add_all([s, alice, bob, carol])
+        db.session.flush()
+        p = Project(name='P1', sprint_id=s.id)
+        db.session.add(p)
+        db.session.flush()
+        db.session.add_all([
+            Assignment(sprint_id=s.id, project_id=p.id, resource_id=alice.id, capacity=60),
+            Assignment(sprint_id=s.id, project_id=p.id, resource_id=alice.id, capacity=15),
+            Assignment(sprint_id=s.id, project_id=p.id, resource_id=bob.id,   capacity=100),
+        ])
+        db.session.commit()
+
+        assert queries.used_capacity(s.id) == {alice.id: 75, bob.id: 100}
+        avail = [(r['name'], r['remaining']) for r in queries.pool_page(s.id)[0]]
+        assert avail == [('Alice', 25), ('Carol', 100)]
+
+
+def test_view_sprint_query_count_is_constant(app, client, count_queries):
+    small = seed_sprint(app, n_projects=2, n_resources=4)
+    client.get(f'/sprints/{small}')
+    count_queries.clear()
+    resp = client.get(f'/sprints/{small}')
+    assert resp.status_code == 200
+    small_count = len(count_queries)
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    lookup_cache.invalidate()
+    large = seed_sprint(app, n_projects=20, n_resources=200)
+    client.get(f'/sprints/{large}')
+    count_queries.clear()
+    resp = client.get(f'/sprints/{large}')
+    assert resp.status_code == 200
+    assert b'R0199' in resp.data
+
+    assert len(count_queries) == small_count
+    assert small_count <= 8
+
+
+def test_list_resources_query_count_is_constant(app, client, count_queries):
+    seed_sprint(app, n_projects=1, n_resources=50)
+    client.get('/resources')
+    count_queries.clear()
+    resp = client.get('/resources')
+    assert resp.status_code == 200
+    assert len(count_queries) <= 3   # revision, cache version, one keyset page
@@ -0,0 +1,84 @@
+# tests/test_sprint_copy.py
+from sqlalchemy import insert
+
+from app import db, Sprint, Project, Resource, Assignment
+
+
+def seed(app, n_projects=3, n_resources=10):
+    with app.app_context():
+        s = Sprint(name='S1')
+        db.session.add(s)
+        db.session.flush()
+        projects  = [Project(name=f'P{i}', sprint_id=s.id) for i in range(n_projects)]
+        resources = [Resource(name=f'R{i}') for i in range(n_resources)]
+        db.session.add_all(projects + resources)
+        db.session.flush()
+        db.session.execute(insert(Assignment), [
+            {'sprint_id': s.id, 'project_id': projects[i % n_projects].id,
+             'resource_id': r.id, 'capacity': 50}
+            for i, r in enumerate(resources)
+        ])
+        db.session.commit()
+        return s.id
+
+
+def snapshot(sprint_id):
+    names = {p.id: p.name for p in Project.query.filter_by(sprint_id=sprint_id)}
+    return sorted((names[a.project_id], a.resource_id, a.capacity)
+                  for a in Assignment.query.filter_by(sprint_id=sprint_id))
+
+
+def test_copy_sprint_duplicates_projects_and_assignments(app, client, count_queries):
+    src = seed(app, n_projects=5, n_resources=2000)
+    count_queries.clear()
+    resp = client.post(f'/sprints/copy/{src}', json={'name': 'S2'})
+    assert resp.status_code == 200
+    # SQLite inserts projects one per statement to keep RETURNING in order;
+    # the 2000 assignments still take a single statement.
+    assert len(count_queries) < 10 + 5
+    new = resp.get_json()['sprint']['id']
+
+    with app.app_context():
+        assert db.session.get(Sprint, new).name == 'S2'
+        assert snapshot(new) == snapshot(src)
+
+
+def test_copy_sprint_projects_only_and_scaled(app, client):
+    src = seed(app)
+    client.post(f'/sprints/copy/{src}', data={'projects_only': 'on'})
+    resp = client.post(f'/sprints/copy/{src}', json={'scale': 50})
+    scaled = resp.get_json()['sprint']['id']
+
+    with app.app_context():
+        copy = Sprint.query.filter_by(name='S1 (copy)').order_by(Sprint.id).first()
+        assert [p.name for p in copy.projects] == ['P0', 'P1', 'P2']
+        assert copy.assignments == []
+        assert {a.capacity for a in Assignment.query.filter_by(sprint_id=scaled)} == {25}
+
+
+def test_copy_sprint_rejects_bad_scale(app, client):
+    src = seed(app)
+    for scale in (150, 0, '', None):
+        resp = client.post(f'/sprints/copy/{src}', json={'scale': scale})
+        assert resp.status_code == 400, scale
+
+
+def test_copy_sprint_maps_projects_by_source_id(app, client):
+    src = seed(app, n_projects=3, n_resources=6)
+    with app.app_context():
+        # Leave a gap in the source ids so old and new ids differ by more than an offset.
+        db.session.delete(Project.query.filter_by(sprint_id=src, name='P1').one())
+        db.session.commit()
+    new = client.post(f'/sprints/copy/{src}', json={}).get_json()['sprint']['id']
+    with app.app_context():
+        assert snapshot(new) == snapshot(src)
+
+
+def test_copy_sprint_statement_size_does_not_grow_with_projects(app, client, count_queries):
+    src = seed(app, n_projects=400, n_resources=800)
+    count_queries.clear()
+    new = client.post(f'/sprints/copy/{src}', json={'scale': 50}).get_json()['sprint']['id']
+    copy = [s for s in count_queries if s.startswith('INSERT INTO assignment')]
+    assert len(copy) == 1 and copy[0].count('?') < 10     # not two per project
+    with app.app_context():
+        assert len(snapshot(new)) == 800